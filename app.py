@@ -1,9 +1,12 @@
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-import sqlite3
-import PyPDF2
 import datetime
 import collections
+import json
+
+from db import ConnectionManager, sqlite_options_from_env
+from extraction import extract_pdf_text
+from migrations import migrate, BackfillRunner, decode_top_words, decode_used_fallback
 
 app = FastAPI(title="SmartDocAI Backend")
 
@@ -17,34 +20,16 @@ app.add_middleware(
 )
 
 DB_PATH = "smartdocai.db"
+db = ConnectionManager(DB_PATH, **sqlite_options_from_env())
 
 # ================================
 # Database init + migration
 # ================================
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        filename TEXT,
-        content TEXT
-    )
-    """)
-    # Add new columns if missing
-    cols = [r[1] for r in cursor.execute("PRAGMA table_info(resumes);").fetchall()]
-    if "summary" not in cols:
-        cursor.execute("ALTER TABLE resumes ADD COLUMN summary TEXT")
-    if "uploaded_at" not in cols:
-        cursor.execute("ALTER TABLE resumes ADD COLUMN uploaded_at TEXT")
-    if "used_fallback" not in cols:
-        cursor.execute("ALTER TABLE resumes ADD COLUMN used_fallback TEXT")
-    if "top_words" not in cols:
-        cursor.execute("ALTER TABLE resumes ADD COLUMN top_words TEXT")
-    conn.commit()
-    conn.close()
-
-init_db()
+# Shared versioned schema (migrations.py); legacy rows are rewritten, and
+# rows indexed for search / term stats / near-duplicates, in the background
+migrate(db)
+backfills = BackfillRunner(db)
+backfills.start()
 
 # ================================
 # Fake summarizer (replace with Sarvam AI)
@@ -64,9 +49,7 @@ def root():
 async def upload_resume(file: UploadFile = File(...)):
     try:
         # Extract PDF text
-        file.file.seek(0)
-        pdf_reader = PyPDF2.PdfReader(file.file)
-        text = "\n".join([p.extract_text() or "" for p in pdf_reader.pages])
+        text = extract_pdf_text(file.file)
 
         uploaded_at = datetime.datetime.utcnow().isoformat()
         summary = summarize_with_ai(text)
@@ -81,14 +64,12 @@ async def upload_resume(file: UploadFile = File(...)):
             summary = "Fallback summary generated from top words."
 
         # Store in DB
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO resumes (filename, content, summary, uploaded_at, used_fallback, top_words)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (file.filename, text, summary, uploaded_at, used_fallback, ",".join(top_words)))
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            conn.execute("""
+                INSERT INTO resumes (filename, content, summary, uploaded_at, used_fallback, top_words)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (file.filename, text, summary, uploaded_at, int(used_fallback == "True"), json.dumps(top_words)))
+        backfills.start()  # index the new row
 
         return {
             "message": "Resume uploaded successfully",
@@ -104,13 +85,11 @@ async def upload_resume(file: UploadFile = File(...)):
 
 @app.get("/insights")
 def get_insights(id: int = None, limit: int = 50):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    cursor = db.connection().cursor()
 
     if id:
         cursor.execute("SELECT id, filename, summary, uploaded_at, used_fallback, top_words FROM resumes WHERE id = ?", (id,))
         row = cursor.fetchone()
-        conn.close()
         if not row:
             return {"error": "Resume not found"}
         return {
@@ -118,13 +97,12 @@ def get_insights(id: int = None, limit: int = 50):
             "filename": row[1],
             "summary": row[2],
             "uploaded_at": row[3],
-            "used_fallback": row[4],
-            "top_words": row[5].split(",") if row[5] else []
+            "used_fallback": str(decode_used_fallback(row[4])),
+            "top_words": decode_top_words(row[5])
         }
 
     cursor.execute("SELECT id, filename, summary, uploaded_at, used_fallback, top_words FROM resumes ORDER BY id DESC LIMIT ?", (limit,))
     rows = cursor.fetchall()
-    conn.close()
 
     return [
         {
@@ -132,8 +110,8 @@ def get_insights(id: int = None, limit: int = 50):
             "filename": r[1],
             "summary": r[2],
             "uploaded_at": r[3],
-            "used_fallback": r[4],
-            "top_words": r[5].split(",") if r[5] else []
+            "used_fallback": str(decode_used_fallback(r[4])),
+            "top_words": decode_top_words(r[5])
         }
         for r in rows
     ]
@@ -1,17 +1,61 @@
 # --- Core imports ---
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-import sqlite3
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
 import os
-import pdfplumber
-from datetime import datetime
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 import json
-import re
-from collections import Counter
+import hashlib
+import hmac
+import csv
+import io
+import time
+
+from extraction import (
+    ENGINES,
+    EXTRACTOR_VERSION,
+    extract_pages_chain,
+    count_pdf_pages,
+    extract_page_range,
+    shard_ranges,
+    join_pages,
+)
 
 # --- Env + HTTP ---
 from dotenv import load_dotenv
-import requests
+
+from sarvam import SarvamClient, AsyncSarvamClient, CircuitBreaker, MAX_PAYLOAD_CHARS
+from summary_cache import SummaryCache, normalize_payload, payload_key
+import jobs
+from jobs import JobStore
+from db import ConnectionManager, sqlite_options_from_env
+from migrations import migrate, BackfillRunner, decode_top_words, decode_used_fallback
+from search import search_resumes, index_resume
+from near_dup import (
+    minhash_signature,
+    index_signature,
+    find_similar,
+    load_signature,
+    DEFAULT_THRESHOLD,
+)
+from match_index import MatchIndex
+from blob_store import BlobStore
+from metrics import Registry
+from profiling import Profiler, active_session, profile_requested, profiled_call
+from response_cache import ResponseCache, table_version, validators, not_modified
+from term_stats import add_document, term_counts, top_terms
+from content_store import (
+    register_functions,
+    store_content,
+    load_content,
+    compact_inline_content,
+    archive_older_than,
+    tier_stats,
+)
 
 # Load environment variables from .env
 # Expected keys (optional):
@@ -22,6 +66,101 @@ load_dotenv()
 SARVAM_API_KEY = os.getenv("SARVAM_API_KEY")
 SARVAM_SUMMARY_URL = os.getenv("SARVAM_SUMMARY_URL")  # leave empty to always use fallback
 
+# Sarvam client tuning (optional overrides):
+#   SARVAM_ATTEMPT_TIMEOUT_S=5     # per HTTP attempt
+#   SARVAM_DEADLINE_S=15           # total budget across retries
+#   SARVAM_RETRIES=2
+#   SARVAM_BREAKER_THRESHOLD=5     # consecutive failures before skipping Sarvam
+#   SARVAM_BREAKER_COOLDOWN_S=30
+SARVAM_OPTIONS = {
+    "attempt_timeout": float(os.getenv("SARVAM_ATTEMPT_TIMEOUT_S", "5")),
+    "deadline": float(os.getenv("SARVAM_DEADLINE_S", "15")),
+    "retries": int(os.getenv("SARVAM_RETRIES", "2")),
+}
+SARVAM_BREAKER_THRESHOLD = int(os.getenv("SARVAM_BREAKER_THRESHOLD", "5"))
+SARVAM_BREAKER_COOLDOWN_S = float(os.getenv("SARVAM_BREAKER_COOLDOWN_S", "30"))
+
+# Summary cache (optional overrides):
+#   SMARTDOCAI_SUMMARY_CACHE_TTL_S=2592000   # 30 days
+#   SMARTDOCAI_SUMMARY_CACHE_MAX=10000
+SUMMARY_CACHE_TTL_S = float(os.getenv("SMARTDOCAI_SUMMARY_CACHE_TTL_S", str(30 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SMARTDOCAI_SUMMARY_CACHE_MAX", "10000"))
+
+# Worker pools (optional overrides):
+#   SMARTDOCAI_EXTRACT_WORKERS=4   # processes for PDF extraction, 0 = use the I/O threads
+#   SMARTDOCAI_IO_WORKERS=8        # threads for disk, SQLite and Sarvam calls
+EXTRACT_WORKERS = int(os.getenv("SMARTDOCAI_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+IO_WORKERS = int(os.getenv("SMARTDOCAI_IO_WORKERS", "8"))
+
+# Upload limits (optional overrides):
+#   SMARTDOCAI_MAX_UPLOAD_MB=50     # per file
+#   SMARTDOCAI_MAX_BATCH_MB=2048    # whole POST /upload-resumes body
+MAX_UPLOAD_BYTES = int(float(os.getenv("SMARTDOCAI_MAX_UPLOAD_MB", "50")) * 1024 * 1024)
+MAX_BATCH_BYTES = int(float(os.getenv("SMARTDOCAI_MAX_BATCH_MB", "2048")) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries + part headers around the file
+
+# Page-parallel extraction (optional override):
+#   SMARTDOCAI_PAGE_PARALLEL_THRESHOLD=20   # PDFs with at least this many pages are sharded
+PAGE_PARALLEL_THRESHOLD = int(os.getenv("SMARTDOCAI_PAGE_PARALLEL_THRESHOLD", "20"))
+MIN_PAGES_PER_SHARD = 4
+
+# Extraction engines, fastest first; the last one is the layout-aware fallback
+# used when earlier engines fail the quality check (see extraction.py):
+#   SMARTDOCAI_EXTRACT_ENGINES=pypdf2,pdfplumber
+EXTRACT_CHAIN = tuple(e.strip() for e in os.getenv("SMARTDOCAI_EXTRACT_ENGINES", "pypdf2,pdfplumber").split(",") if e.strip())
+_unknown_engines = set(EXTRACT_CHAIN) - set(ENGINES)
+if not EXTRACT_CHAIN or _unknown_engines:
+    raise ValueError(f"SMARTDOCAI_EXTRACT_ENGINES: unknown engines {sorted(_unknown_engines)}; known: {sorted(ENGINES)}")
+
+# Batch uploads (optional override):
+#   SMARTDOCAI_BATCH_CONCURRENCY=4   # files processed at once per /upload-resumes request
+BATCH_CONCURRENCY = int(os.getenv("SMARTDOCAI_BATCH_CONCURRENCY", "4"))
+
+# Async job queue (optional overrides):
+#   SMARTDOCAI_JOB_WORKERS=2         # jobs processed at once
+#   SMARTDOCAI_JOB_QUEUE_DEPTH=100   # queued jobs before ?async=true returns 503
+JOB_WORKERS = int(os.getenv("SMARTDOCAI_JOB_WORKERS", "2"))
+JOB_QUEUE_DEPTH = int(os.getenv("SMARTDOCAI_JOB_QUEUE_DEPTH", "100"))
+
+# Schema migrations (optional overrides, see migrations.py):
+#   SMARTDOCAI_MIGRATION_BATCH=500      # rows rewritten or indexed per committed batch
+#   SMARTDOCAI_MIGRATION_PAUSE_MS=0     # sleep between batches to leave room for uploads
+MIGRATION_BATCH = int(os.getenv("SMARTDOCAI_MIGRATION_BATCH", "500"))
+MIGRATION_PAUSE_MS = float(os.getenv("SMARTDOCAI_MIGRATION_PAUSE_MS", "0"))
+
+# Content tiering (optional overrides):
+#   SMARTDOCAI_ARCHIVE_AFTER_DAYS=180   # move content of older resumes to the cold tier, 0 = never
+#   SMARTDOCAI_ARCHIVE_INTERVAL_H=24
+ARCHIVE_AFTER_DAYS = float(os.getenv("SMARTDOCAI_ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_INTERVAL_H = float(os.getenv("SMARTDOCAI_ARCHIVE_INTERVAL_H", "24"))
+
+# Near-duplicate detection (optional override):
+#   SMARTDOCAI_NEAR_DUP_THRESHOLD=0.8   # estimated Jaccard similarity that flags an upload
+NEAR_DUP_THRESHOLD = float(os.getenv("SMARTDOCAI_NEAR_DUP_THRESHOLD", str(DEFAULT_THRESHOLD)))
+
+# Job-description matching (optional override):
+#   SMARTDOCAI_MATCH_DIR=match_index   # memory-mapped BM25 matrix files
+MATCH_DIR = os.getenv("SMARTDOCAI_MATCH_DIR", "match_index")
+
+# Upload blob store garbage collection (optional override, see blob_store.py):
+#   SMARTDOCAI_UPLOAD_GC_GRACE_H=24   # unreferenced uploads younger than this are kept
+UPLOAD_GC_GRACE_H = float(os.getenv("SMARTDOCAI_UPLOAD_GC_GRACE_H", "24"))
+
+# /insights response cache (optional override):
+#   SMARTDOCAI_INSIGHTS_CACHE_MAX=256   # serialized responses kept per data version, 0 = off
+INSIGHTS_CACHE_MAX_ENTRIES = int(os.getenv("SMARTDOCAI_INSIGHTS_CACHE_MAX", "256"))
+
+# Admin endpoints and upload profiling (optional overrides):
+#   SMARTDOCAI_ADMIN_TOKEN=secret           # X-Admin-Token for /admin/*; unset disables them
+#   SMARTDOCAI_PROFILE_SAMPLE_RATE=0.01     # fraction of uploads profiled continuously
+#   SMARTDOCAI_PROFILE_KEEP=50              # newest profiles kept on disk
+#   SMARTDOCAI_PROFILE_DIR=profiles
+ADMIN_TOKEN = os.getenv("SMARTDOCAI_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("SMARTDOCAI_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_KEEP = int(os.getenv("SMARTDOCAI_PROFILE_KEEP", "50"))
+PROFILE_DIR = os.getenv("SMARTDOCAI_PROFILE_DIR", "profiles")
+
 # ================================
 #  FastAPI Setup
 # ================================
@@ -35,76 +174,485 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized uploads from Content-Length before the body is read.
+
+    Batch uploads are checked against the batch limit; spool_upload still
+    enforces the per-file limit on each of their files.
+    """
+    if request.method == "POST":
+        length = request.headers.get("content-length")
+        limit = MAX_BATCH_BYTES if request.url.path == "/upload-resumes" else MAX_UPLOAD_BYTES
+        if length and length.isdigit() and int(length) > limit + MULTIPART_OVERHEAD:
+            return JSONResponse(status_code=413, content={"detail": "Upload exceeds the maximum allowed size."})
+    return await call_next(request)
+
+
+# ================================
+#  Metrics
+# ================================
+# Prometheus text format on GET /metrics (see metrics.py). Stage timings are
+# wall time as seen by the request, including any wait for a pool worker.
+metrics = Registry()
+REQUEST_SECONDS = metrics.histogram(
+    "smartdocai_http_request_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+STAGE_SECONDS = metrics.histogram(
+    "smartdocai_upload_stage_seconds", "Time spent in each upload pipeline stage.", ("stage",)
+)
+UPLOAD_BYTES = metrics.histogram(
+    "smartdocai_upload_bytes", "Size of spooled uploads.",
+    buckets=tuple(2 ** n * 1024 for n in range(4, 17, 2)),  # 16 KiB .. 64 MiB
+)
+UPLOAD_PAGES = metrics.histogram(
+    "smartdocai_upload_pages", "Pages per extracted PDF.", buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+)
+EXTRACT_ENGINE_SECONDS = metrics.histogram(
+    "smartdocai_extract_engine_seconds", "Extraction time per engine attempt.", ("engine", "accepted")
+)
+EXTRACT_FALLBACKS = metrics.counter(
+    "smartdocai_extract_fallbacks_total", "Extractions handed to the next engine, by reason.", ("engine", "reason")
+)
+UPLOADS = metrics.counter("smartdocai_uploads_total", "Uploads by outcome.", ("outcome",))
+SUMMARIES = metrics.counter("smartdocai_summaries_total", "Summaries by source (sarvam, cache, fallback).", ("source",))
+SARVAM_ERRORS = metrics.counter("smartdocai_sarvam_errors_total", "Failed Sarvam attempts by error class.", ("error",))
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route template, not the raw path, keeps label values bounded
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status,
+        )
+
+
+def is_admin(request: Request) -> bool:
+    token = request.headers.get("x-admin-token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set SMARTDOCAI_ADMIN_TOKEN).")
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+@app.middleware("http")
+async def profile_on_request(request: Request, call_next):
+    """``X-Profile: 1`` with a valid admin token profiles the uploads in this request."""
+    if request.headers.get("x-profile") == "1" and is_admin(request):
+        profile_requested.set(True)
+    return await call_next(request)
+
+
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ================================
+#  Worker Pools
+# ================================
+# Blocking work never runs on the event loop: CPU-bound extraction goes to a
+# process pool, blocking I/O (disk, SQLite, HTTP) to a thread pool. Pools are
+# created on first use so importing this module stays cheap.
+_extract_pool: ProcessPoolExecutor | None = None
+_io_pool: ThreadPoolExecutor | None = None
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=max(1, IO_WORKERS), thread_name_prefix="smartdocai-io")
+    return _io_pool
+
+
+def get_extract_pool():
+    global _extract_pool
+    if EXTRACT_WORKERS <= 0:
+        return get_io_pool()
+    if _extract_pool is None:
+        # spawn, not fork: workers must not inherit the event loop, the
+        # thread pools or open SQLite connections of this process
+        _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _extract_pool
+
+
+async def run_cpu(fn, *args):
+    """Run a CPU-bound, picklable callable on the extraction pool."""
+    return await _run_in(get_extract_pool(), fn, *args)
+
+
+async def run_io(fn, *args):
+    """Run a blocking I/O callable on the thread pool."""
+    return await _run_in(get_io_pool(), fn, *args)
+
+
+async def _run_in(pool, fn, *args):
+    loop = asyncio.get_running_loop()
+    session = active_session.get()
+    if session is None:
+        return await loop.run_in_executor(pool, fn, *args)
+    # Profiled upload: profile the call where it runs and keep its stats
+    result, raw, seconds = await loop.run_in_executor(pool, profiled_call, fn, *args)
+    session.add(fn, raw, seconds)
+    return result
+
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    global _extract_pool, _io_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+        _extract_pool = None
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _io_pool = None
+
+# ================================
+#  Sarvam Clients
+# ================================
+# One breaker for both clients so sync callers and uploads see the same state
+sarvam_breaker = CircuitBreaker(SARVAM_BREAKER_THRESHOLD, SARVAM_BREAKER_COOLDOWN_S)
+
+
+def count_sarvam_error(kind: str):
+    SARVAM_ERRORS.inc(error=kind)
+
+
+sarvam_client = SarvamClient(
+    SARVAM_SUMMARY_URL, SARVAM_API_KEY, breaker=sarvam_breaker, pool_size=IO_WORKERS,
+    on_error=count_sarvam_error, **SARVAM_OPTIONS
+)
+_sarvam_async: AsyncSarvamClient | None = None
+
 # ================================
 #  Database Setup
 # ================================
 DB_PATH = "smartdocai.db"
 UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Content-addressed and sharded: uploads/ab/cd/<sha256>.pdf, one file per distinct PDF
+blob_store = BlobStore(UPLOAD_DIR)
 
 
-def init_db():
-    """Initialize database with full schema."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS resumes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            filename TEXT,
-            filepath TEXT,
-            content TEXT,
-            summary TEXT,
-            top_words TEXT,
-            uploaded_at TEXT,
-            used_fallback INTEGER
-        )
-        """
-    )
-    conn.commit()
-    conn.close()
+# Shared per-thread connections (WAL + tuned pragmas, see db.py)
+db = ConnectionManager(DB_PATH, on_connect=[register_functions], **sqlite_options_from_env())
+
+
+# Every table this module uses is created by the versioned migrations
+# (migrations.py); row rewrites and index backfills run in batches after
+# startup, and legacy inline content is compacted then
+migrate(db)
 
+# Sarvam summary cache lives in the same database
+summary_cache = SummaryCache(db, SUMMARY_CACHE_TTL_S, SUMMARY_CACHE_MAX_ENTRIES)
 
-init_db()
+# Sparse term matrix for POST /match; files on disk, term ids in the database
+match_index = MatchIndex(db, MATCH_DIR)
+match_index.load()
+
+# Row rewrites and index backfills queued by migrations; one pass at a time
+backfills = BackfillRunner(db, MIGRATION_BATCH, MIGRATION_PAUSE_MS / 1000)
+
+# /insights cache keyed by the resumes version counter (ETag / Last-Modified)
+insights_cache = ResponseCache(INSIGHTS_CACHE_MAX_ENTRIES)
+
+profiler = Profiler(PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_KEEP)
 
 # ================================
-#  Utils
+#  Job Queue
 # ================================
-WORD_RE = re.compile(r"[A-Za-z]{4,}")  # only words with 4+ letters
+# Asynchronous uploads: the request stages the file and records a job, then
+# a fixed set of worker tasks extracts, summarizes and inserts it.
+job_store = JobStore(db)
+job_queue: asyncio.Queue | None = None
+_job_workers: list[asyncio.Task] = []
+
+
+async def run_job(job_id: str):
+    job = await run_io(job_store.get, job_id)
+    if not job or job["status"] not in (jobs.QUEUED, jobs.RUNNING):
+        return
+    await run_io(job_store.set_status, job_id, jobs.RUNNING)
+    try:
+        staged = {"filename": job["filename"], "filepath": job["filepath"], "content_hash": job["content_hash"]}
+        rec = await analyze_upload(staged)
+        resume_id = await run_io(insert_resume, rec)
+        await run_io(job_store.set_status, job_id, jobs.DONE, upload_response(rec, resume_id))
+    except HTTPException as e:
+        await run_io(job_store.set_status, job_id, jobs.FAILED, None, str(e.detail))
+    except Exception as e:
+        await run_io(job_store.set_status, job_id, jobs.FAILED, None, str(e))
+
 
+async def job_worker():
+    while True:
+        job_id = await job_queue.get()
+        try:
+            await run_job(job_id)
+        finally:
+            job_queue.task_done()
 
+
+async def requeue_pending_jobs():
+    for job_id in await run_io(job_store.pending_ids):
+        await job_queue.put(job_id)
+
+
+async def storage_maintenance():
+    await run_io(compact_inline_content, db)
+    if ARCHIVE_AFTER_DAYS <= 0:
+        return
+    while True:
+        cutoff = (datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+        await run_io(archive_older_than, db, cutoff)
+        await asyncio.sleep(ARCHIVE_INTERVAL_H * 3600)
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    global job_queue
+    job_queue = asyncio.Queue(maxsize=max(1, JOB_QUEUE_DEPTH))
+    for _ in range(max(1, JOB_WORKERS)):
+        _job_workers.append(asyncio.create_task(job_worker()))
+    # Jobs left over from a previous run; awaits queue space in the background
+    _job_workers.append(asyncio.create_task(requeue_pending_jobs()))
+    # Row rewrites and index backfills queued by migrations, without delaying startup
+    _job_workers.append(asyncio.create_task(run_io(backfills.run)))
+    _job_workers.append(asyncio.create_task(run_io(match_index.sync)))
+    # Compact legacy inline content, then keep archiving old content to the cold tier
+    _job_workers.append(asyncio.create_task(storage_maintenance()))
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    for task in _job_workers:
+        task.cancel()
+    await asyncio.gather(*_job_workers, return_exceptions=True)
+    _job_workers.clear()
+    db.close_all()
+
+
+# ================================
+#  Utils
+# ================================
 def extract_top_words(text: str, n: int = 5):
-    words = [w.lower() for w in WORD_RE.findall(text)]
-    counts = Counter(words).most_common(n)
-    return [w for w, _ in counts]
+    # Same tokenizer as the corpus term statistics (4+ letter words, lowercased)
+    return [w for w, _ in term_counts(text).most_common(n)]
+
+
+async def extract_text(file_path: str, handle=None) -> tuple[str, str]:
+    """Extract a stored upload off the event loop; returns (text, engine used).
+
+    The fast engines of EXTRACT_CHAIN run first, in one worker call; if none
+    passes the quality check, the fallback engine runs. Large PDFs are then
+    split into page ranges across the extraction processes and reassembled
+    in page order. ``handle`` is used instead of the path when extraction
+    runs in-process.
+    """
+    source = handle if EXTRACT_WORKERS <= 0 and handle is not None else file_path
+    pages, attempts = await run_cpu(extract_pages_chain, source, EXTRACT_CHAIN, True)
+    if pages is None:
+        fallback = EXTRACT_CHAIN[-1]
+        start = time.perf_counter()
+        if EXTRACT_WORKERS > 1:
+            n_pages = await run_io(count_pdf_pages, file_path, fallback)
+            if n_pages >= PAGE_PARALLEL_THRESHOLD:
+                n_shards = min(EXTRACT_WORKERS, max(1, n_pages // MIN_PAGES_PER_SHARD))
+                shards = await asyncio.gather(
+                    *(run_cpu(extract_page_range, file_path, a, b, fallback) for a, b in shard_ranges(n_pages, n_shards))
+                )
+                pages = [text for shard in shards for text in shard]
+        if pages is None:
+            pages, _ = await run_cpu(extract_pages_chain, source, (fallback,))
+        attempts.append({"engine": fallback, "seconds": time.perf_counter() - start, "accepted": True, "reason": None})
+
+    for attempt in attempts:
+        EXTRACT_ENGINE_SECONDS.observe(attempt["seconds"], engine=attempt["engine"], accepted=str(attempt["accepted"]).lower())
+        if not attempt["accepted"]:
+            EXTRACT_FALLBACKS.inc(engine=attempt["engine"], reason=attempt["reason"])
+    UPLOAD_PAGES.observe(len(pages))
+    return join_pages(pages), attempts[-1]["engine"]
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def spool_upload(src, dest_path: str, max_bytes: int = MAX_UPLOAD_BYTES) -> tuple[str, int]:
+    """Copy an upload to ``dest_path`` in chunks, hashing as it streams.
+
+    Returns (sha256 hex digest, size). Raises UploadTooLarge as soon as the
+    stream passes ``max_bytes``; the partial file is removed.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    src.seek(0)
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = src.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        discard_file(dest_path)
+        raise
+    src.seek(0)
+    return digest.hexdigest(), size
+
+
+def discard_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+INSERT_RESUME_SQL = """
+    INSERT INTO resumes (
+        filename, filepath, content, summary, top_words, uploaded_at, used_fallback, content_hash,
+        extractor, extractor_version
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def resume_params(rec: dict) -> tuple:
+    return (
+        rec["filename"],
+        rec["filepath"],
+        None,  # text is stored compressed in resume_content
+        rec["summary"],
+        json.dumps(rec["top_words"]),
+        rec["uploaded_at"],
+        int(rec["used_fallback"]),
+        rec["content_hash"],
+        rec["extractor"],
+        EXTRACTOR_VERSION,
+    )
+
+
+def insert_resume(rec: dict) -> int:
+    """Persist one processed resume and return its id."""
+    return insert_resumes([rec])[0]
+
+
+def insert_resumes(recs: list[dict]) -> list[int]:
+    """Persist processed resumes (row, compressed text, search index, term
+    statistics, MinHash buckets) in a single transaction; returns their ids in order."""
+    ids = []
+    with STAGE_SECONDS.time(stage="db_insert"), db.transaction() as conn:
+        cursor = conn.cursor()
+        for rec in recs:
+            cursor.execute(INSERT_RESUME_SQL, resume_params(rec))
+            resume_id = cursor.lastrowid
+            store_content(conn, resume_id, rec["content"])
+            index_resume(conn, resume_id, rec["content"], rec["summary"])
+            add_document(conn, resume_id, rec["content"], rec["uploaded_at"])
+            index_signature(conn, resume_id, rec.get("minhash"))
+            ids.append(resume_id)
+    UPLOADS.inc(len(ids), outcome="stored")
+    # Append the new rows to the match matrix without holding up the response,
+    # and index any rows other writers (app.py) stored since the last run
+    get_io_pool().submit(match_index.sync)
+    get_io_pool().submit(backfills.run)
+    return ids
+
+
+def find_by_hash(content_hash: str):
+    """Return the most recent stored resume with this content hash, or None."""
+    cursor = db.connection().cursor()
+    cursor.execute(
+        """
+        SELECT id, filename, summary, top_words, uploaded_at, used_fallback
+        FROM resumes WHERE content_hash = ? ORDER BY id DESC LIMIT 1
+        """,
+        (content_hash,),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    return {
+        "id": row[0],
+        "filename": row[1],
+        "uploaded_at": row[4],
+        "summary": row[2],
+        "top_words": decode_top_words(row[3]),
+        "used_fallback": decode_used_fallback(row[5]),
+        "deduplicated": True,
+    }
 
 
 def summarize_with_sarvam(text: str) -> str | None:
     """
     Try Sarvam AI summarization if SARVAM_SUMMARY_URL and SARVAM_API_KEY are set.
     Expected JSON response to contain a 'summary' field.
-    Returns None if unavailable or on error.
+    Returns None if unavailable, on error, or while the circuit breaker is open.
+    Summaries are cached by normalized payload text.
     """
-    if not SARVAM_SUMMARY_URL or not SARVAM_API_KEY:
+    if not sarvam_client.configured:
         return None
+    payload = normalize_payload(text, MAX_PAYLOAD_CHARS)
+    key = payload_key(payload)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        SUMMARIES.inc(source="cache")
+        return cached
+    summary = sarvam_client.summarize(payload)
+    if summary is not None:
+        SUMMARIES.inc(source="sarvam")
+        summary_cache.put(key, summary)
+    return summary
 
-    payload = {"text": text[:4000]}  # keep payload small
-    headers = {
-        "Authorization": f"Bearer {SARVAM_API_KEY}",
-        "Content-Type": "application/json",
-    }
 
-    try:
-        resp = requests.post(SARVAM_SUMMARY_URL, json=payload, headers=headers, timeout=15)
-        if resp.status_code == 200:
-            data = resp.json()
-            summary = data.get("summary")
-            if summary and summary.strip():
-                return summary.strip()
-        # Non-200 or missing summary -> treat as failure
-        return None
-    except Exception:
+async def summarize_with_sarvam_async(text: str) -> str | None:
+    """Event-loop variant of summarize_with_sarvam; shares its cache and circuit breaker."""
+    global _sarvam_async
+    if not sarvam_client.configured:
         return None
+    payload = normalize_payload(text, MAX_PAYLOAD_CHARS)
+    key = payload_key(payload)
+    cached = await run_io(summary_cache.get, key)
+    if cached is not None:
+        SUMMARIES.inc(source="cache")
+        return cached
+    if _sarvam_async is None:
+        _sarvam_async = AsyncSarvamClient(
+            SARVAM_SUMMARY_URL, SARVAM_API_KEY, breaker=sarvam_breaker, on_error=count_sarvam_error, **SARVAM_OPTIONS
+        )
+    summary = await _sarvam_async.summarize(payload)
+    if summary is not None:
+        SUMMARIES.inc(source="sarvam")
+        await run_io(summary_cache.put, key, summary)
+    return summary
+
+
+@app.on_event("shutdown")
+async def close_sarvam_clients():
+    global _sarvam_async
+    sarvam_client.close()
+    if _sarvam_async is not None:
+        await _sarvam_async.aclose()
+        _sarvam_async = None
 
 
 # ================================
@@ -115,66 +663,167 @@ def ping():
     return {"status": "ok"}
 
 
+@app.get("/storage/stats")
+def get_storage_stats():
+    """Row counts and compressed sizes of the hot and cold content tiers."""
+    return tier_stats(db)
+
+
+@app.get("/insights-cache/stats")
+def get_insights_cache_stats():
+    return insights_cache.stats()
+
+
+@app.get("/summary-cache/stats")
+def get_summary_cache_stats():
+    """Sarvam summary cache size and hit/miss counters (since process start)."""
+    return summary_cache.stats()
+
+
+async def stage_upload(src, filename: str, force: bool = False) -> tuple[dict | None, dict | None]:
+    """Spool one upload to the blob store and check for a stored duplicate.
+
+    Returns ``(existing, None)`` for a dedup hit, otherwise
+    ``(None, {"filename", "filepath", "content_hash"})``; ``filepath`` is the
+    blob's content-addressed path and ``filename`` only a display name.
+    """
+    # Stream to a temp name in uploads/.incoming/, hashing on the way
+    tmp_path = blob_store.staging_path()
+    try:
+        with STAGE_SECONDS.time(stage="spool"):
+            content_hash, size = await run_io(spool_upload, src, tmp_path)
+    except UploadTooLarge:
+        UPLOADS.inc(outcome="too_large")
+        raise HTTPException(status_code=413, detail="Upload exceeds the maximum allowed size.")
+    UPLOAD_BYTES.observe(size)
+
+    # Dedup: same bytes -> same text -> reuse the stored summary
+    if not force:
+        with STAGE_SECONDS.time(stage="dedup_lookup"):
+            existing = await run_io(find_by_hash, content_hash)
+        if existing:
+            UPLOADS.inc(outcome="deduplicated")
+            await run_io(discard_file, tmp_path)
+            return existing, None
+
+    file_path = await run_io(blob_store.commit, tmp_path, content_hash)
+    return None, {"filename": filename, "filepath": file_path, "content_hash": content_hash}
+
+
+async def analyze_upload(staged: dict, handle=None) -> dict:
+    """Extract and summarize a staged upload; returns a record ready for insert_resume(s).
+
+    Profiled (see profiling.py) when requested, armed or sampled; the record
+    then carries the ``profile_id``.
+    """
+    session = profiler.start(staged["filename"])
+    if session is None:
+        return await _analyze_upload(staged, handle)
+    token = active_session.set(session)
+    error = None
+    try:
+        rec = await _analyze_upload(staged, handle)
+        rec["profile_id"] = session.id
+        return rec
+    except Exception as e:
+        error = str(getattr(e, "detail", e))
+        raise
+    finally:
+        active_session.reset(token)
+        await run_io(profiler.save, session, error)
+
+
+async def _analyze_upload(staged: dict, handle=None) -> dict:
+    # Extract text through EXTRACT_CHAIN (pypdf2 first, pdfplumber as the
+    # fallback), off the event loop. Worker processes need the path;
+    # in-process extraction reads the spooled upload directly.
+    with STAGE_SECONDS.time(stage="extract"):
+        text, extractor = await extract_text(staged["filepath"], handle=handle)
+
+    if not text.strip():
+        UPLOADS.inc(outcome="no_text")
+        raise HTTPException(status_code=400, detail="No text could be extracted from the PDF.")
+
+    # Try AI summarization via Sarvam
+    with STAGE_SECONDS.time(stage="summarize"):
+        summary = await summarize_with_sarvam_async(text)
+
+    # Fallback: Top 5 most frequent words
+    used_fallback = summary is None
+    if used_fallback:
+        SUMMARIES.inc(source="fallback")
+        top_words = extract_top_words(text, n=5)
+        summary = "Fallback insight — Top 5 frequent words: " + ", ".join(top_words)
+    else:
+        top_words = extract_top_words(text, n=5)
+
+    # Near-duplicate check against already stored resumes
+    with STAGE_SECONDS.time(stage="near_dup"):
+        minhash = await run_cpu(minhash_signature, text)
+        near_duplicates = await run_io(lambda: find_similar(db.connection(), minhash, NEAR_DUP_THRESHOLD))
+
+    return {
+        **staged,
+        "minhash": minhash,
+        "near_duplicates": near_duplicates,
+        "content": text,
+        "extractor": extractor,
+        "summary": summary,
+        "top_words": top_words,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        "used_fallback": used_fallback,
+    }
+
+
+async def process_upload(file: UploadFile, force: bool = False) -> tuple[dict | None, dict | None]:
+    """Spool, dedup, extract and summarize one upload without persisting it.
+
+    Returns ``(existing, None)`` for a dedup hit, otherwise ``(None, record)``
+    where ``record`` is ready for insert_resume(s). Raises HTTPException.
+    """
+    existing, staged = await stage_upload(file.file, file.filename, force)
+    if existing:
+        return existing, None
+    return None, await analyze_upload(staged, handle=file.file)
+
+
+def upload_response(rec: dict, resume_id: int) -> dict:
+    return {
+        "id": resume_id,
+        "filename": rec["filename"],
+        "uploaded_at": rec["uploaded_at"],
+        "summary": rec["summary"],
+        "top_words": rec["top_words"],
+        "used_fallback": rec["used_fallback"],
+        "deduplicated": False,
+        "near_duplicates": rec.get("near_duplicates", []),
+        **({"profile_id": rec["profile_id"]} if rec.get("profile_id") else {}),
+    }
+
+
 @app.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
-    """Upload a PDF resume, extract text, summarize (Sarvam if available), save history."""
+async def upload_resume(
+    file: UploadFile = File(...),
+    force: bool = False,
+    async_: bool = Query(False, alias="async"),
+):
+    """Upload a PDF resume, extract text, summarize (Sarvam if available), save history.
+
+    Byte-identical re-uploads return the stored result without re-processing;
+    pass ``force=true`` to bypass the lookup. With ``async=true`` the upload is
+    queued and a 202 with a job id is returned; poll ``GET /jobs/{id}``.
+    """
     try:
-        # Save uploaded file to disk
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        file_bytes = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(file_bytes)
-
-        # Extract text using pdfplumber
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                text += page_text + "\n"
-
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No text could be extracted from the PDF.")
-
-        # Try AI summarization via Sarvam
-        summary = summarize_with_sarvam(text)
-
-        # Fallback: Top 5 most frequent words
-        used_fallback = summary is None
-        if used_fallback:
-            top_words = extract_top_words(text, n=5)
-            summary = "Fallback insight — Top 5 frequent words: " + ", ".join(top_words)
-        else:
-            top_words = extract_top_words(text, n=5)
+        if async_:
+            return await enqueue_upload(file, force)
 
-        # Persist to DB
-        uploaded_at = datetime.utcnow().isoformat()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO resumes (filename, filepath, content, summary, top_words, uploaded_at, used_fallback)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                file.filename,
-                file_path,
-                text,
-                summary,
-                json.dumps(top_words),
-                uploaded_at,
-                int(used_fallback),
-            ),
-        )
-        conn.commit()
-        conn.close()
+        existing, rec = await process_upload(file, force)
+        if existing:
+            return existing
 
-        return {
-            "filename": file.filename,
-            "uploaded_at": uploaded_at,
-            "summary": summary,
-            "top_words": top_words,
-            "used_fallback": used_fallback,
-        }
+        # Persist to DB
+        resume_id = await run_io(insert_resume, rec)
+        return upload_response(rec, resume_id)
 
     except HTTPException:
         raise
@@ -182,35 +831,402 @@ async def upload_resume(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/insights")
-def get_insights(limit: int = 20, id: int | None = None):
-    """Fetch resume history or a specific resume by ID."""
+@app.post("/upload-resumes")
+async def upload_resumes(files: list[UploadFile] = File(...), force: bool = False):
+    """Upload many PDF resumes in one request.
+
+    Files are processed concurrently (bounded by SMARTDOCAI_BATCH_CONCURRENCY)
+    and all new rows are written in one transaction. Each file gets its own
+    result; a bad PDF is reported in place and does not fail the batch.
+    """
+    sem = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+    async def one(file: UploadFile):
+        async with sem:
+            try:
+                existing, rec = await process_upload(file, force)
+                return existing, rec, None
+            except HTTPException as e:
+                return None, None, {"filename": file.filename, "error": e.detail, "status_code": e.status_code}
+            except Exception as e:
+                return None, None, {"filename": file.filename, "error": str(e), "status_code": 500}
+
+    outcomes = await asyncio.gather(*(one(f) for f in files))
+
+    new_recs = [rec for _, rec, _ in outcomes if rec is not None]
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        if id:
-            cursor.execute("SELECT * FROM resumes WHERE id = ?", (id,))
+        new_ids = iter(await run_io(insert_resumes, new_recs)) if new_recs else iter(())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = []
+    for existing, rec, error in outcomes:
+        if error:
+            results.append(error)
+        elif existing:
+            results.append(existing)
         else:
-            cursor.execute("SELECT * FROM resumes ORDER BY id DESC LIMIT ?", (limit,))
-        rows = cursor.fetchall()
-        conn.close()
+            results.append(upload_response(rec, next(new_ids)))
+
+    return {
+        "count": len(results),
+        "succeeded": sum(1 for r in results if "error" not in r),
+        "failed": sum(1 for r in results if "error" in r),
+        "results": results,
+    }
+
+
+async def enqueue_upload(file: UploadFile, force: bool):
+    # Fail fast instead of spooling a file we have no room to process
+    if job_queue is None or job_queue.full():
+        raise HTTPException(status_code=503, detail="Job queue is full, retry later.")
+
+    existing, staged = await stage_upload(file.file, file.filename, force)
+    if existing:
+        return existing
+
+    job_id = await run_io(job_store.create, staged["filename"], staged["filepath"], staged["content_hash"])
+    try:
+        job_queue.put_nowait(job_id)
+    except asyncio.QueueFull:
+        # The client is told to retry, so the job must not also run on the next restart
+        detail = "Job queue is full, retry later."
+        await run_io(job_store.set_status, job_id, jobs.FAILED, None, detail)
+        raise HTTPException(status_code=503, detail=detail)
+    return JSONResponse(status_code=202, content={"job_id": job_id, "status": jobs.QUEUED})
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Report the state of an asynchronous upload and, once done, its result."""
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("filepath", None)
+    return job
+
+
+# Columns /insights can project, in response order. ``content`` is stored
+# compressed and only decompressed for a single-record (``id=``) request.
+INSIGHT_FIELDS = ("id", "filename", "filepath", "content", "summary", "top_words", "uploaded_at", "used_fallback")
+LIST_FIELDS = tuple(f for f in INSIGHT_FIELDS if f != "content")
+LIGHT_FIELDS = ("id", "filename", "uploaded_at")
+MAX_PAGE_SIZE = 500
+
+
+def parse_fields(fields: str | None, single: bool) -> tuple[str, ...]:
+    if not fields:
+        return INSIGHT_FIELDS if single else LIST_FIELDS
+    if fields == "light":
+        return LIGHT_FIELDS
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - set(INSIGHT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    if "content" in wanted and not single:
+        raise HTTPException(status_code=400, detail="content is only available with id=")
+    # id is always returned; it is the pagination cursor
+    return tuple(f for f in INSIGHT_FIELDS if f in wanted or f == "id")
+
 
-        items = []
-        for r in rows:
-            items.append(
-                {
-                    "id": r[0],
-                    "filename": r[1],
-                    "filepath": r[2],
-                    "content": r[3],
-                    "summary": r[4],
-                    "top_words": json.loads(r[5]) if r[5] else [],
-                    "uploaded_at": r[6],
-                    "used_fallback": bool(r[7]),
-                }
+def insight_item(cols: tuple[str, ...], r) -> dict:
+    item = dict(zip(cols, r))
+    if "top_words" in item:
+        item["top_words"] = decode_top_words(item["top_words"])
+    if "used_fallback" in item:
+        item["used_fallback"] = decode_used_fallback(item["used_fallback"])
+    return item
+
+
+def query_insights(
+    limit: int, id: int | None, fields: str | None, before_id: int | None, after_id: int | None
+) -> tuple[dict | list, dict]:
+    """Body and extra headers for one /insights request."""
+    cols = parse_fields(fields, single=bool(id))
+    if before_id is not None and after_id is not None:
+        raise HTTPException(status_code=400, detail="Use either before_id or after_id, not both.")
+    sql_cols = tuple(c for c in cols if c != "content")
+    select = f"SELECT {', '.join(sql_cols)} FROM resumes"
+    conn = db.connection()
+    cursor = conn.cursor()
+    if id:
+        cursor.execute(f"{select} WHERE id = ?", (id,))
+    elif before_id is not None:
+        cursor.execute(f"{select} WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+    elif after_id is not None:
+        cursor.execute(f"{select} WHERE id > ? ORDER BY id ASC LIMIT ?", (after_id, limit))
+    else:
+        cursor.execute(f"{select} ORDER BY id DESC LIMIT ?", (limit,))
+    rows = cursor.fetchall()
+    if after_id is not None and not id:
+        rows.reverse()
+
+    items = [insight_item(sql_cols, r) for r in rows]
+    if id:
+        if not items:
+            return {}, {}
+        item = items[0]
+        if "content" in cols:
+            item["content"] = load_content(conn, id)
+        # Keep the documented field order
+        return {c: item[c] for c in cols}, {}
+
+    headers = {}
+    if len(items) == limit:
+        headers["X-Next-Before-Id"] = str(items[-1]["id"])
+    return items, headers
+
+
+@app.get("/insights")
+def get_insights(
+    request: Request,
+    limit: int = 20,
+    id: int | None = None,
+    fields: str | None = None,
+    before_id: int | None = None,
+    after_id: int | None = None,
+):
+    """Fetch resume history or a specific resume by ID.
+
+    ``fields`` is a comma-separated projection (or ``light`` for
+    id/filename/uploaded_at); omit it for every field. ``content`` is stored
+    compressed and only returned for a single record (``id=``). Pages are newest first:
+    pass ``before_id`` (the last id seen) for the next page or ``after_id`` for
+    the previous one. Seeks use the id primary key, so deep pages cost the
+    same as the first. ``X-Next-Before-Id`` is set when more rows may follow.
+
+    Responses carry an ETag and Last-Modified from the resumes version
+    counter; a matching ``If-None-Match`` / ``If-Modified-Since`` gets a 304.
+    Serialized responses are cached per version (``/insights-cache/stats``).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        version, modified_at = table_version(db.connection(), "resumes")
+        cache_headers = validators("resumes", version, modified_at)
+        if not_modified(request.headers, cache_headers["ETag"], modified_at):
+            return Response(status_code=304, headers=cache_headers)
+
+        key = (limit, id, fields, before_id, after_id)
+        cached = insights_cache.get(version, key)
+        if cached is None:
+            body, headers = query_insights(limit, id, fields, before_id, after_id)
+            cached = (JSONResponse(body).body, headers)
+            insights_cache.put(version, key, cached)
+        body, headers = cached
+        return Response(body, media_type="application/json", headers={**headers, **cache_headers})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/insights/terms")
+def get_term_insights(top: int = 20, since: str | None = None, by: str = "doc_freq"):
+    """Most common terms across all resumes (or uploads since a YYYY-MM-DD day).
+
+    Answered from the incrementally maintained term_stats aggregates; never
+    scans resume text. ``by`` is ``doc_freq`` or ``total_count``.
+    """
+    if by not in ("doc_freq", "total_count"):
+        raise HTTPException(status_code=400, detail="by must be 'doc_freq' or 'total_count'")
+    top = max(1, min(top, MAX_PAGE_SIZE))
+    try:
+        return top_terms(db, top, since, by)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/resumes/{resume_id}/similar")
+def get_similar_resumes(resume_id: int, threshold: float | None = None, limit: int = 10):
+    """Stored resumes that are near-duplicates of this one (MinHash/LSH), most similar first."""
+    conn = db.connection()
+    sig = load_signature(conn, resume_id)
+    if sig is None:
+        raise HTTPException(status_code=404, detail="Resume not found or not indexed yet")
+    threshold = NEAR_DUP_THRESHOLD if threshold is None else threshold
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return {
+        "id": resume_id,
+        "threshold": threshold,
+        "similar": find_similar(conn, sig, threshold, limit, exclude_id=resume_id),
+    }
+
+
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "ncalls", "pcalls", "filename", "name")
+
+
+@app.get("/admin/profiles")
+def list_profiles(request: Request):
+    """Stored upload profiles, newest first, with per-call wall times."""
+    require_admin(request)
+    return {**profiler.state(), "profiles": profiler.list()}
+
+
+@app.post("/admin/profiles/arm")
+def arm_profiling(request: Request, count: int = 1):
+    """Profile the next ``count`` uploads (0 disarms)."""
+    require_admin(request)
+    profiler.arm(count)
+    return profiler.state()
+
+
+@app.get("/admin/profiles/{profile_id}")
+def download_profile(request: Request, profile_id: str, format: str = "prof", sort: str = "cumulative", top: int = 40):
+    """Download a profile as a pstats file (``format=prof``, open with
+    ``python -m pstats`` or snakeviz) or as a text listing (``format=text``)."""
+    require_admin(request)
+    if format not in ("prof", "text"):
+        raise HTTPException(status_code=400, detail="format must be 'prof' or 'text'")
+    if sort not in PROFILE_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(PROFILE_SORT_KEYS)}")
+    path = profiler.file(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profiler.report(profile_id, sort, max(1, min(top, MAX_PAGE_SIZE))))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+@app.post("/admin/uploads/gc")
+async def collect_upload_garbage(request: Request, dry_run: bool = True, grace_h: float | None = None):
+    """Remove stored uploads no resume or pending job refers to (dry run by default)."""
+    require_admin(request)
+    grace_s = (UPLOAD_GC_GRACE_H if grace_h is None else grace_h) * 3600
+    return await run_io(blob_store.gc, db, grace_s, dry_run)
+
+
+class MatchRequest(BaseModel):
+    text: str
+    top_k: int = 10
+
+
+@app.post("/match")
+def match(req: MatchRequest):
+    """Rank every stored resume against a job description (BM25), best first.
+
+    Scores come from the memory-mapped term matrix, not from resume text, so
+    the cost is one vectorized pass over the matrix entries.
+    """
+    top_k = max(1, min(req.top_k, MAX_PAGE_SIZE))
+    try:
+        results = match_index.top_k(req.text, top_k)
+        if results:
+            marks = ", ".join("?" for _ in results)
+            names = dict(
+                db.connection().execute(
+                    f"SELECT id, filename FROM resumes WHERE id IN ({marks})", [r["id"] for r in results]
+                )
             )
+            for r in results:
+                r["filename"] = names.get(r["id"])
+        return {"top_k": top_k, "documents": match_index.stats()["documents"], "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return items if not id else (items[0] if items else {})
 
+@app.get("/search")
+def search(q: str, limit: int = 20, offset: int = 0):
+    """Full-text search over resume content and summaries, best match first.
+
+    Every word in ``q`` must match (stemmed, case-insensitive). Snippets wrap
+    hits in ``<mark>``. Page with ``limit``/``offset``.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    try:
+        return {"query": q, "limit": limit, "offset": offset, "results": search_resumes(db, q, limit, offset)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+EXPORT_COLUMNS = ("id", "filename", "filepath", "summary", "top_words", "uploaded_at", "used_fallback")
+EXPORT_BATCH = 500
+
+
+def export_rows(since: str | None, until: str | None, include_content: bool):
+    """Yield export rows as dicts from a server-side cursor, EXPORT_BATCH at a time."""
+    select = ", ".join(f"r.{c}" for c in EXPORT_COLUMNS)
+    joins = ""
+    if include_content:
+        select += ", COALESCE(r.content, unz(h.codec, h.data), unz(c.codec, c.data))"
+        joins = (
+            " LEFT JOIN resume_content h ON h.resume_id = r.id"
+            " LEFT JOIN resume_content_cold c ON c.resume_id = r.id"
+        )
+    where, params = [], []
+    if since:
+        where.append("r.uploaded_at >= ?")
+        params.append(since)
+    if until:
+        where.append("r.uploaded_at < ?")
+        params.append(until)
+    sql = f"SELECT {select} FROM resumes r{joins}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY r.id"
+
+    cols = EXPORT_COLUMNS + (("content",) if include_content else ())
+    # Own connection: the stream is resumed from whichever thread is free
+    conn = db.open_dedicated()
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            batch = cursor.fetchmany(EXPORT_BATCH)
+            if not batch:
+                break
+            yield [insight_item(cols, r) for r in batch]
+    finally:
+        conn.close()
+
+
+def export_ndjson(batches):
+    for batch in batches:
+        yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in batch)
+
+
+def export_csv(batches, cols):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(cols)
+    for batch in batches:
+        for item in batch:
+            item["top_words"] = json.dumps(item["top_words"])
+            writer.writerow(item[c] for c in cols)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+@app.get("/export")
+def export(
+    format: str = "ndjson",
+    since: str | None = None,
+    until: str | None = None,
+    include_content: bool = False,
+):
+    """Stream every processed resume as NDJSON or CSV.
+
+    Rows come straight off a database cursor in id order, so memory use does
+    not grow with the table. ``since``/``until`` filter ``uploaded_at``
+    (ISO timestamps, ``since`` inclusive, ``until`` exclusive);
+    ``include_content=true`` adds the decompressed extracted text.
+    """
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    batches = export_rows(since, until, include_content)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    if format == "csv":
+        cols = EXPORT_COLUMNS + (("content",) if include_content else ())
+        return StreamingResponse(
+            export_csv(batches, cols),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="resumes-{stamp}.csv"'},
+        )
+    return StreamingResponse(
+        export_ndjson(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="resumes-{stamp}.ndjson"'},
+    )
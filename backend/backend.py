@@ -1,11 +1,16 @@
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-import sqlite3
-import PyPDF2
 import re
 import os
+import sys
 import logging
 
+# Shared helpers (db.py) live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db import ConnectionManager, sqlite_options_from_env  # noqa: E402
+from extraction import extract_pdf_text  # noqa: E402
+from migrations import migrate, BackfillRunner  # noqa: E402
+
 # ================================
 #  Logging
 # ================================
@@ -31,22 +36,13 @@ app.add_middleware(
 # ================================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "smartdocai.db")
+db = ConnectionManager(DB_PATH, **sqlite_options_from_env())
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        filename TEXT,
-        content TEXT,
-        summary TEXT
-    )
-    """)
-    conn.commit()
-    conn.close()
-
-init_db()
+# Shared versioned schema (migrations.py); legacy rows are rewritten, and
+# rows indexed for search / term stats / near-duplicates, in the background
+migrate(db)
+backfills = BackfillRunner(db)
+backfills.start()
 
 # ================================
 #  Text Cleaning + Summarization
@@ -80,22 +76,16 @@ def ping():
 @app.post("/upload-resume")
 async def upload_resume(file: UploadFile = File(...)):
     try:
-        text = ""
-        pdf_reader = PyPDF2.PdfReader(file.file)
-        for page in pdf_reader.pages:
-            text += page.extract_text() or ""
-
+        text = extract_pdf_text(file.file)
         text = clean_text(text)
         summary = summarize_resume(text)
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO resumes (filename, content, summary) VALUES (?, ?, ?)",
-            (file.filename, text, summary)
-        )
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO resumes (filename, content, summary) VALUES (?, ?, ?)",
+                (file.filename, text, summary)
+            )
+        backfills.start()  # index the new row
 
         logger.info(f"Inserted resume: {file.filename}")
 
@@ -111,11 +101,9 @@ async def upload_resume(file: UploadFile = File(...)):
 
 @app.get("/insights")
 def get_insights():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    cursor = db.connection().cursor()
     cursor.execute("SELECT id, filename, content, summary FROM resumes")
     rows = cursor.fetchall()
-    conn.close()
 
     return {
         "resumes": [
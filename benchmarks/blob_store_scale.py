@@ -0,0 +1,99 @@
+"""
+Lookup, listing and GC cost of the sharded upload store at scale.
+
+    python benchmarks/blob_store_scale.py --blobs 200000 --referenced 0.9
+
+Fills a temp blob store with small files named by random SHA-256 digests,
+records ``--referenced`` of them as resume rows in a SQLite database, then
+times exists() lookups, a full stats() walk and a garbage collection (dry
+run, then for real). Prints JSON, including the fullest leaf directory.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blob_store import BlobStore  # noqa: E402
+from db import ConnectionManager  # noqa: E402
+from benchmarks.search_latency import percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blobs", type=int, default=200_000)
+    parser.add_argument("--referenced", type=float, default=0.9)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hashes = [hashlib.sha256(rng.randbytes(16)).hexdigest() for _ in range(args.blobs)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(os.path.join(tmp, "uploads"))
+        t0 = time.perf_counter()
+        for h in hashes:
+            path = store.staging_path()
+            with open(path, "wb") as f:
+                f.write(b"%PDF-1.4\n")
+            store.commit(path, h)
+        fill_s = time.perf_counter() - t0
+
+        db_path = os.path.join(tmp, "smartdocai.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE resumes (id INTEGER PRIMARY KEY, content_hash TEXT)")
+        conn.execute("CREATE INDEX idx_resumes_content_hash ON resumes (content_hash)")
+        keep = rng.sample(hashes, int(len(hashes) * args.referenced))
+        conn.executemany("INSERT INTO resumes (content_hash) VALUES (?)", ((h,) for h in keep))
+        conn.commit()
+        conn.close()
+
+        # Age every blob past the grace period
+        old = time.time() - 7200
+        for _, leaf in store.leaves():
+            for _, entry in store.blobs_in(leaf):
+                os.utime(entry.path, (old, old))
+
+        probes = rng.sample(hashes, min(args.lookups, len(hashes)))
+        lookup_us = []
+        for h in probes:
+            t = time.perf_counter()
+            store.exists(h)
+            lookup_us.append((time.perf_counter() - t) * 1e6)
+
+        t0 = time.perf_counter()
+        stats = store.stats()
+        stats_s = time.perf_counter() - t0
+        largest_leaf = max(len(os.listdir(leaf)) for _, leaf in store.leaves())
+
+        db = ConnectionManager(db_path)
+        t0 = time.perf_counter()
+        dry = store.gc(db, grace_s=3600, dry_run=True)
+        dry_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        real = store.gc(db, grace_s=3600)
+        gc_s = time.perf_counter() - t0
+        db.close_all()
+
+    print(json.dumps({
+        "blobs": args.blobs,
+        "fill_s": round(fill_s, 2),
+        "leaf_dirs": stats["leaf_dirs"],
+        "largest_leaf_files": largest_leaf,
+        "exists_us": {f"p{p}": round(percentile(lookup_us, p), 2) for p in (50, 99)},
+        "stats_walk_s": round(stats_s, 3),
+        "gc_dry_run_s": round(dry_s, 3),
+        "gc_s": round(gc_s, 3),
+        "gc": real,
+        "dry_run_agrees": dry["removed"] == real["removed"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
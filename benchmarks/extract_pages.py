@@ -0,0 +1,91 @@
+"""
+Compare in-process and page-sharded fallback extraction.
+
+    python benchmarks/extract_pages.py --workers 4 --repeat 3
+
+Generates 1-, 10- and 200-page synthetic PDFs and prints the best-of-N wall
+time for each path as JSON. The sharded path takes the same steps as
+backend.extract_text() when every fast engine is rejected: count pages with
+the fallback engine, then, at ``--threshold`` pages or more, split them into
+extract_page_range() shards across the process pool; smaller PDFs run whole
+in one worker.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import (  # noqa: E402
+    count_pdf_pages,
+    extract_page_range,
+    extract_pages_chain,
+    join_pages,
+    shard_ranges,
+)
+from benchmarks.synthetic_pdf import make_pdf  # noqa: E402
+
+FALLBACK = "pdfplumber"
+MIN_PAGES_PER_SHARD = 4  # same as backend.py
+
+
+def extract_sharded(path, pool, workers, threshold):
+    """backend.extract_text()'s fallback step, with blocking waits instead of awaits."""
+    n_pages = count_pdf_pages(path, FALLBACK)
+    if workers > 1 and n_pages >= threshold:
+        n_shards = min(workers, max(1, n_pages // MIN_PAGES_PER_SHARD))
+        futures = [pool.submit(extract_page_range, path, a, b, FALLBACK) for a, b in shard_ranges(n_pages, n_shards)]
+        return join_pages(text for f in futures for text in f.result()), n_shards
+    pages, _ = pool.submit(extract_pages_chain, path, (FALLBACK,)).result()
+    return join_pages(pages), 1
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 200])
+    parser.add_argument("--threshold", type=int, default=20, help="SMARTDOCAI_PAGE_PARALLEL_THRESHOLD")
+    args = parser.parse_args()
+
+    results = []
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(args.workers, mp_context=spawn) as pool:
+        # Warm the pool so process start-up isn't billed to the first run
+        list(pool.map(abs, range(args.workers)))
+        for n in args.pages:
+            path = os.path.join(tmp, f"synthetic_{n}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_pdf(n, seed=n))
+
+            seq_s, seq_pages = best_of(args.repeat, lambda: extract_pages_chain(path, (FALLBACK,))[0])
+            par_s, (par_text, shards) = best_of(args.repeat, lambda: extract_sharded(path, pool, args.workers, args.threshold))
+            seq_text = join_pages(seq_pages)
+            results.append({
+                "pages": n,
+                "shards": shards,
+                "sequential_s": round(seq_s, 4),
+                "parallel_s": round(par_s, 4),
+                "speedup": round(seq_s / par_s, 2) if par_s else None,
+                "identical_text": seq_text == par_text,
+            })
+
+    print(json.dumps({"workers": args.workers, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start cost of each Features page engine, one fresh interpreter per component.
+
+    python benchmarks/features_cold_start.py --repeat 3
+
+Times the import and the model load each tab pays on first use (the same
+steps as the loaders in pages/2_Features.py) and prints the best of N as
+JSON. Components whose packages are not installed report an error instead.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+COMPONENTS = {
+    "streamlit": ("import streamlit", None),
+    "gtts": ("from gtts import gTTS", None),
+    "cv2": ("import cv2", None),
+    "easyocr": ("import easyocr", "easyocr.Reader(['en'], gpu=False)"),
+    "whisper": ("import whisper", "whisper.load_model('base')"),
+}
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+{import_stmt}
+t1 = time.perf_counter()
+{load_stmt}
+t2 = time.perf_counter()
+with open('/proc/self/status') as f:
+    rss = next((int(l.split()[1]) for l in f if l.startswith('VmHWM:')), None)
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "load_ms": (t2 - t1) * 1000, "peak_rss_kb": rss}}))
+"""
+
+
+def probe(import_stmt, load_stmt):
+    code = PROBE.format(import_stmt=import_stmt, load_stmt=load_stmt or "pass")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--components", nargs="+", default=list(COMPONENTS), choices=list(COMPONENTS))
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.components:
+        runs = [probe(*COMPONENTS[name]) for _ in range(max(1, args.repeat))]
+        ok = [r for r in runs if "error" not in r]
+        if not ok:
+            report[name] = runs[0]
+            continue
+        report[name] = {
+            "import_ms": round(min(r["import_ms"] for r in ok), 1),
+            "load_ms": round(min(r["load_ms"] for r in ok), 1) if COMPONENTS[name][1] else None,
+            "peak_rss_mb": round(max(r["peak_rss_kb"] or 0 for r in ok) / 1024, 1),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
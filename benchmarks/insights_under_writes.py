@@ -0,0 +1,154 @@
+"""
+/insights read throughput under concurrent upload writes, before and after
+the shared connection manager.
+
+    python benchmarks/insights_under_writes.py --readers 8 --writers 2 --seconds 5
+
+Runs the /insights list query and the upload INSERT directly against a
+temporary database, once with connect-per-call in rollback-journal mode
+(the old behaviour) and once through db.ConnectionManager (WAL, tuned
+pragmas, per-thread connections). Prints both runs as JSON.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionManager  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT, filepath TEXT, content TEXT, summary TEXT,
+    top_words TEXT, uploaded_at TEXT, used_fallback INTEGER, content_hash TEXT
+)
+"""
+INSERT = """
+INSERT INTO resumes (filename, filepath, content, summary, top_words, uploaded_at, used_fallback, content_hash)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+LIST = "SELECT * FROM resumes ORDER BY id DESC LIMIT ?"
+CONTENT = "experience python kubernetes " * 400
+
+
+def row(i):
+    return (f"r{i}.pdf", f"uploads/r{i}.pdf", CONTENT, "summary", "[]", "2024-01-01T00:00:00", 1, f"h{i}")
+
+
+class Legacy:
+    """Connect, run, close, like the original endpoints."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def read(self, limit):
+        conn = sqlite3.connect(self.path)
+        conn.execute(LIST, (limit,)).fetchall()
+        conn.close()
+
+    def write(self, i):
+        conn = sqlite3.connect(self.path)
+        conn.execute(INSERT, row(i))
+        conn.commit()
+        conn.close()
+
+
+class Managed:
+    def __init__(self, path):
+        self.db = ConnectionManager(path)
+
+    def read(self, limit):
+        self.db.connection().execute(LIST, (limit,)).fetchall()
+
+    def write(self, i):
+        with self.db.transaction() as conn:
+            conn.execute(INSERT, row(i))
+
+
+def run(mode, readers, writers, seconds, limit):
+    counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader():
+        n = errors = 0
+        while not stop.is_set():
+            try:
+                mode.read(limit)
+                n += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += n
+            counts["read_errors"] += errors
+
+    def writer(offset):
+        n = errors = 0
+        i = offset
+        while not stop.is_set():
+            try:
+                mode.write(i)
+                n += 1
+            except sqlite3.OperationalError:
+                errors += 1
+            i += writers
+        with lock:
+            counts["writes"] += n
+            counts["write_errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1_000_000 + k,)) for k in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {
+        **counts,
+        "reads_per_s": round(counts["reads"] / seconds, 1),
+        "writes_per_s": round(counts["writes"] / seconds, 1),
+    }
+
+
+def seed(path, rows, wal):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+    conn.execute(SCHEMA)
+    conn.executemany(INSERT, (row(i) for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        before = os.path.join(tmp, "before.db")
+        seed(before, args.rows, wal=False)
+        results["before"] = run(Legacy(before), args.readers, args.writers, args.seconds, args.limit)
+
+        after = os.path.join(tmp, "after.db")
+        seed(after, args.rows, wal=True)
+        managed = Managed(after)
+        results["after"] = run(managed, args.readers, args.writers, args.seconds, args.limit)
+        managed.db.close_all()
+
+    print(json.dumps({"config": vars(args), **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
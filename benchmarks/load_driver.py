@@ -0,0 +1,318 @@
+"""
+Load driver for /upload-resume and /insights with JSON results for run-to-run comparison.
+
+    python -m benchmarks.load_driver run --spawn --scenario mixed --concurrency 8 --duration 30 --out run.json
+    python -m benchmarks.load_driver compare baseline.json run.json
+
+``--spawn`` starts a throwaway backend (uvicorn, empty database in a temp
+directory) wired to an in-process Sarvam stub (benchmarks/sarvam_stub.py),
+and tracks the peak RSS of the server and its worker processes. Without it,
+``--url`` targets a server you started; pass ``--server-pid`` to get RSS.
+Uploads cycle through the deterministic synthetic resume corpus; repeats
+are summarized from the summary cache, so raise ``--corpus-count`` to keep
+every upload on the Sarvam path.
+
+Scenarios: ``upload``, ``insights`` or ``mixed`` (``--insights-ratio`` of the
+requests are reads). The report has throughput, error counts and
+p50/p95/p99/max latency per endpoint.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_pdf import resume_corpus  # noqa: E402
+from benchmarks.sarvam_stub import add_stub_arguments, config_from_args, start_stub  # noqa: E402
+from benchmarks.search_latency import percentile  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 95, 99)
+
+
+# ---------- process memory ----------
+def _status_kb(pid: int, field: str) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _children(pid: int) -> list[int]:
+    kids = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                kids.extend(int(k) for k in f.read().split())
+    except OSError:
+        pass
+    return kids
+
+
+def tree_rss_kb(pid: int) -> int:
+    """Resident memory of ``pid`` and all its descendants (Linux /proc)."""
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        total += _status_kb(p, "VmRSS")
+        stack.extend(_children(p))
+    return total
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.is_set():
+            self.peak_kb = max(self.peak_kb, tree_rss_kb(self.pid))
+            self.stop.wait(self.interval)
+
+
+# ---------- spawned server ----------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_backend(workdir: str, stub_url: str, extra_env: dict) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        "SARVAM_SUMMARY_URL": stub_url,
+        "SARVAM_API_KEY": "benchmark",
+        **extra_env,
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"backend exited with code {proc.returncode}")
+        try:
+            if requests.get(f"{url}/ping", timeout=1).ok:
+                return proc, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("backend did not become ready within 60 s")
+
+
+# ---------- load ----------
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, endpoint: str, ms: float, ok: bool):
+        with self.lock:
+            if ok:
+                self.latencies.setdefault(endpoint, []).append(ms)
+            else:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, seconds: float) -> dict:
+        out = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(endpoint, [])
+            out[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput_rps": round(len(samples) / seconds, 3),
+                **{f"p{p}_ms": round(percentile(samples, p), 2) if samples else None for p in PERCENTILES},
+                "max_ms": round(max(samples), 2) if samples else None,
+            }
+        return out
+
+
+def worker(n, args, url, corpus, deadline, recorder, counter):
+    rng = random.Random(args.seed * 7919 + n)
+    session = requests.Session()
+    while time.time() < deadline:
+        with counter["lock"]:
+            if args.requests and counter["issued"] >= args.requests:
+                return
+            counter["issued"] += 1
+            i = counter["issued"]
+        read = args.scenario == "insights" or (args.scenario == "mixed" and rng.random() < args.insights_ratio)
+        t0 = time.perf_counter()
+        try:
+            if read:
+                endpoint = "insights"
+                resp = session.get(f"{url}/insights", params={"limit": args.insights_limit}, timeout=args.timeout)
+            else:
+                endpoint = "upload-resume"
+                name, data = corpus[i % len(corpus)]
+                resp = session.post(
+                    f"{url}/upload-resume",
+                    params={"force": "true"} if args.force else None,
+                    files={"file": (name, data, "application/pdf")},
+                    timeout=args.timeout,
+                )
+            ok = resp.status_code < 400
+        except requests.RequestException:
+            ok = False
+        recorder.record(endpoint, (time.perf_counter() - t0) * 1000, ok)
+
+
+def drive(args, url) -> tuple[dict, float]:
+    corpus = list(resume_corpus(args.corpus_count, args.seed))
+    if args.scenario != "upload":
+        # Reads need rows to read
+        for name, data in corpus[: min(len(corpus), 10)]:
+            requests.post(f"{url}/upload-resume", files={"file": (name, data, "application/pdf")}, timeout=args.timeout)
+    recorder = Recorder()
+    counter = {"lock": threading.Lock(), "issued": 0}
+    start = time.time()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(n, args, url, corpus, deadline, recorder, counter))
+        for n in range(args.concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+    return recorder.report(elapsed), elapsed
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args):
+    extra_env = dict(kv.split("=", 1) for kv in args.env)
+    stub = proc = sampler = None
+    stub_config = config_from_args(args)
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            if args.spawn:
+                stub = start_stub(stub_config)
+                stub_url = f"http://127.0.0.1:{stub.server_address[1]}/summarize"
+                proc, url = spawn_backend(workdir, stub_url, extra_env)
+                pid = proc.pid
+            else:
+                url, pid = args.url, args.server_pid
+            if pid:
+                sampler = RssSampler(pid)
+                sampler.start()
+            endpoints, elapsed = drive(args, url)
+        finally:
+            if sampler:
+                sampler.stop.set()
+                sampler.join()
+            if proc:
+                proc.terminate()
+                proc.wait(timeout=30)
+            if stub:
+                stub.shutdown()
+
+    report = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - elapsed)),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("func", "out")},
+        },
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": endpoints,
+        "peak_rss_mb": round(sampler.peak_kb / 1024, 1) if sampler else None,
+        "sarvam_stub": dict(stub_config.counts) if stub else None,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+def cmd_compare(args):
+    """Side-by-side numbers and relative change for each endpoint metric."""
+    with open(args.baseline) as f:
+        base = json.load(f)
+    with open(args.candidate) as f:
+        cand = json.load(f)
+
+    def change(a, b):
+        if a in (None, 0) or b is None:
+            return None
+        return round((b - a) / a * 100, 1)
+
+    out = {"endpoints": {}}
+    for endpoint in sorted(set(base["endpoints"]) | set(cand["endpoints"])):
+        a, b = base["endpoints"].get(endpoint, {}), cand["endpoints"].get(endpoint, {})
+        out["endpoints"][endpoint] = {
+            metric: {"baseline": a.get(metric), "candidate": b.get(metric), "change_pct": change(a.get(metric), b.get(metric))}
+            for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+        }
+    out["peak_rss_mb"] = {
+        "baseline": base.get("peak_rss_mb"),
+        "candidate": cand.get("peak_rss_mb"),
+        "change_pct": change(base.get("peak_rss_mb"), cand.get("peak_rss_mb")),
+    }
+    print(json.dumps(out, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="drive load and write a JSON report")
+    run.add_argument("--url", default="http://127.0.0.1:8000")
+    run.add_argument("--server-pid", type=int, default=None)
+    run.add_argument("--spawn", action="store_true", help="start a throwaway backend and Sarvam stub")
+    run.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra env for --spawn")
+    run.add_argument("--scenario", choices=("upload", "insights", "mixed"), default="mixed")
+    run.add_argument("--insights-ratio", type=float, default=0.8)
+    run.add_argument("--insights-limit", type=int, default=50)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--duration", type=float, default=30.0)
+    run.add_argument("--requests", type=int, default=0, help="stop after this many requests (0 = duration only)")
+    run.add_argument("--corpus-count", type=int, default=50)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--timeout", type=float, default=300.0)
+    run.add_argument("--no-force", dest="force", action="store_false", help="let re-uploads hit the dedup path")
+    run.add_argument("--out", default=None)
+    add_stub_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="compare two run reports")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Job-description matching latency over the memory-mapped BM25 matrix.
+
+    python benchmarks/match_topk.py --docs 100000
+
+Appends synthetic resumes to a MatchIndex in a temporary directory, then
+times top_k() for job-description sized queries. Prints JSON.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionManager  # noqa: E402
+from match_index import MatchIndex, create_table  # noqa: E402
+from benchmarks.synthetic_pdf import WORDS  # noqa: E402
+from benchmarks.search_latency import synthetic_text, percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--query-words", type=int, default=60)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocab = WORDS + [f"skill{i:04d}" for i in range(5000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "match.db"))
+        with db.transaction() as conn:
+            create_table(conn)
+        index = MatchIndex(db, os.path.join(tmp, "matrix"))
+        index.load()
+
+        t0 = time.perf_counter()
+        for start in range(0, args.docs, args.batch):
+            stop = min(start + args.batch, args.docs)
+            index.append([(i + 1, synthetic_text(rng, vocab, args.words)) for i in range(start, stop)])
+        build_s = time.perf_counter() - t0
+
+        index.top_k("warm up the page cache", args.top_k)
+        samples = []
+        for _ in range(args.queries):
+            query = " ".join(rng.choice(vocab) for _ in range(args.query_words))
+            t = time.perf_counter()
+            index.top_k(query, args.top_k)
+            samples.append((time.perf_counter() - t) * 1000)
+        stats = index.stats()
+        db.close_all()
+
+    print(json.dumps({
+        "docs": args.docs,
+        "matrix_entries": stats["entries"],
+        "terms": stats["terms"],
+        "build_s": round(build_s, 2),
+        "query_words": args.query_words,
+        "top_k_p50_ms": round(percentile(samples, 50), 2),
+        "top_k_p95_ms": round(percentile(samples, 95), 2),
+        "top_k_max_ms": round(max(samples), 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
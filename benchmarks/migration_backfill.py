@@ -0,0 +1,158 @@
+"""
+Batched schema backfill on a legacy database while uploads keep writing.
+
+    python benchmarks/migration_backfill.py --rows 1000000 --batch 500
+
+Builds a database in the old app.py shape (used_fallback TEXT 'True'/'False',
+comma-joined top_words), applies the migrations and runs the row rewrite in
+committed batches while a writer thread inserts a row every few ms, as
+uploads would. For comparison, ``--single`` rewrites every row in one
+transaction. Prints the backfill rate and the writer's insert latency
+(the time it waited for the write lock) as JSON.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionManager  # noqa: E402
+from migrations import MIGRATIONS, migrate, run_backfills, status  # noqa: E402
+from benchmarks.search_latency import percentile  # noqa: E402
+from benchmarks.synthetic_pdf import WORDS  # noqa: E402
+
+
+def build_legacy(path: str, rows: int, seed: int):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE resumes (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT, content TEXT)")
+    for col in ("summary TEXT", "uploaded_at TEXT", "used_fallback TEXT", "top_words TEXT"):
+        conn.execute(f"ALTER TABLE resumes ADD COLUMN {col}")
+    batch = []
+    for i in range(rows):
+        fallback = rng.random() < 0.3
+        words = ",".join(rng.sample(WORDS, 5)) if fallback else ""
+        batch.append((f"r{i}.pdf", "text", "summary", "2024-01-01T00:00:00", str(fallback), words))
+        if len(batch) == 10_000:
+            conn.executemany(
+                "INSERT INTO resumes (filename, content, summary, uploaded_at, used_fallback, top_words) VALUES (?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch.clear()
+    if batch:
+        conn.executemany(
+            "INSERT INTO resumes (filename, content, summary, uploaded_at, used_fallback, top_words) VALUES (?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+    conn.commit()
+    conn.close()
+
+
+class Writer(threading.Thread):
+    """Inserts one canonical row every ``interval`` seconds and records how long each took."""
+
+    def __init__(self, db, interval: float):
+        super().__init__(daemon=True)
+        self.db = db
+        self.interval = interval
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                with self.db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO resumes (filename, summary, top_words, uploaded_at, used_fallback) VALUES (?, ?, ?, ?, ?)",
+                        ("new.pdf", "summary", "[]", "2024-06-01T00:00:00", 0),
+                    )
+                self.latencies.append((time.perf_counter() - t0) * 1000)
+            except sqlite3.OperationalError:
+                self.errors += 1
+            self.stop.wait(self.interval)
+
+
+# Only the legacy value rewrite; the index backfills queued alongside it are not timed
+REWRITE = [m for m in MIGRATIONS if m.name == "normalize_legacy_values"]
+
+
+def single_transaction(db) -> int:
+    rewrite = REWRITE[0]
+    with db.transaction() as conn:
+        state = conn.execute("SELECT done_id, upto_id FROM schema_backfill WHERE version = ?", (rewrite.version,)).fetchone()
+        changed = rewrite.rewrite(conn, state[0], state[1])
+        conn.execute("UPDATE schema_backfill SET done_id = upto_id WHERE version = ?", (rewrite.version,))
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--pause-ms", type=float, default=0.0)
+    parser.add_argument("--write-interval-ms", type=float, default=5.0)
+    parser.add_argument("--single", action="store_true", help="rewrite all rows in one transaction instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.db")
+        t0 = time.perf_counter()
+        build_legacy(path, args.rows, args.seed)
+        build_s = time.perf_counter() - t0
+
+        db = ConnectionManager(path, busy_timeout_ms=30_000)
+        t0 = time.perf_counter()
+        migrate(db)
+        schema_ms = (time.perf_counter() - t0) * 1000
+
+        writer = Writer(ConnectionManager(path, busy_timeout_ms=30_000), args.write_interval_ms / 1000)
+        writer.start()
+        time.sleep(0.2)  # baseline samples before the rewrite starts
+        t0 = time.perf_counter()
+        if args.single:
+            changed = single_transaction(db)
+        else:
+            changed = run_backfills(db, args.batch, args.pause_ms / 1000, migrations=REWRITE)
+        backfill_s = time.perf_counter() - t0
+        time.sleep(0.2)
+        writer.stop.set()
+        writer.join()
+
+        with db.transaction() as conn:
+            legacy_left = conn.execute(
+                "SELECT COUNT(*) FROM resumes WHERE used_fallback IN ('True', 'False') OR (top_words != '' AND top_words NOT LIKE '[%')"
+            ).fetchone()[0]
+        report = {
+            "rows": args.rows,
+            "mode": "single_transaction" if args.single else f"batches_of_{args.batch}",
+            "build_s": round(build_s, 2),
+            "schema_step_ms": round(schema_ms, 2),
+            "backfill_s": round(backfill_s, 3),
+            "rows_changed": changed,
+            "rows_per_s": round(args.rows / backfill_s),
+            "legacy_rows_left": legacy_left,
+            "writer": {
+                "inserts": len(writer.latencies),
+                "errors": writer.errors,
+                **{f"p{p}_ms": round(percentile(writer.latencies, p), 2) for p in (50, 99)},
+                "max_ms": round(max(writer.latencies), 2) if writer.latencies else None,
+            },
+            "version": status(db)["version"],
+        }
+        db.close_all()
+        writer.db.close_all()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
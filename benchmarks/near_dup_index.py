@@ -0,0 +1,95 @@
+"""
+MinHash/LSH index build time and near-duplicate query latency.
+
+    python benchmarks/near_dup_index.py --docs 10000 100000
+
+For each corpus size, signs and buckets synthetic resumes into a temporary
+database (a tenth of them lightly edited copies of others), then times
+find_similar() for random documents. Prints JSON.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionManager  # noqa: E402
+from near_dup import create_minhash_tables, minhash_signature, index_signature, find_similar  # noqa: E402
+from benchmarks.synthetic_pdf import WORDS  # noqa: E402
+from benchmarks.search_latency import percentile  # noqa: E402
+
+
+def corpus(n_docs, n_words, seed=0):
+    rng = random.Random(seed)
+    vocab = WORDS + [f"skill{i:04d}" for i in range(5000)]
+    docs = []
+    for i in range(n_docs):
+        if docs and rng.random() < 0.1:
+            # Lightly edited copy of an earlier resume
+            words = rng.choice(docs).split()
+            for _ in range(max(1, len(words) // 50)):
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            docs.append(" ".join(words))
+        else:
+            docs.append(" ".join(rng.choice(vocab) for _ in range(n_words)))
+    return docs
+
+
+def run(n_docs, n_words, queries, batch):
+    docs = corpus(n_docs, n_words)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "minhash.db"))
+        with db.transaction() as conn:
+            conn.execute("CREATE TABLE resumes (id INTEGER PRIMARY KEY)")
+            create_minhash_tables(conn)
+
+        sign_s = 0.0
+        t0 = time.perf_counter()
+        for start in range(0, n_docs, batch):
+            t = time.perf_counter()
+            sigs = [minhash_signature(d) for d in docs[start:start + batch]]
+            sign_s += time.perf_counter() - t
+            with db.transaction() as conn:
+                for offset, sig in enumerate(sigs):
+                    index_signature(conn, start + offset + 1, sig)
+        build_s = time.perf_counter() - t0
+
+        rng = random.Random(1)
+        conn = db.connection()
+        samples, found = [], 0
+        for _ in range(queries):
+            i = rng.randrange(n_docs)
+            sig = minhash_signature(docs[i])
+            t = time.perf_counter()
+            hits = find_similar(conn, sig, exclude_id=i + 1)
+            samples.append((time.perf_counter() - t) * 1000)
+            found += bool(hits)
+        db.close_all()
+
+    return {
+        "docs": n_docs,
+        "build_s": round(build_s, 2),
+        "signing_s": round(sign_s, 2),
+        "query_p50_ms": round(percentile(samples, 50), 3),
+        "query_p95_ms": round(percentile(samples, 95), 3),
+        "queries_with_near_duplicates": found,
+        "queries": queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps([run(n, args.words, args.queries, args.batch) for n in args.docs], indent=2))
+
+
+if __name__ == "__main__":
+    main()
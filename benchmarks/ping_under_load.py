@@ -0,0 +1,106 @@
+"""
+Measure /ping latency while N resume uploads are in flight.
+
+Run the backend first (``uvicorn backend:app``), then:
+
+    python benchmarks/ping_under_load.py --uploads 8 --pdf uploads/arpit_final_b.pdf
+
+Prints baseline and under-load /ping latency percentiles as JSON. With
+extraction and blocking I/O off the event loop, the two should stay close:
+exits non-zero when the under-load p95 is above ``--max-p95-ms``, so the
+script can gate a CI job.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.search_latency import percentile  # noqa: E402
+
+
+def sample_ping(url, stop, out):
+    session = requests.Session()
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        session.get(f"{url}/ping", timeout=30)
+        out.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.01)
+
+
+def upload(url, pdf_bytes, name):
+    files = {"file": (name, pdf_bytes, "application/pdf")}
+    requests.post(f"{url}/upload-resume", params={"force": "true"}, files=files, timeout=600)
+
+
+def summarize(samples):
+    return {
+        "n": len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "max_ms": max(samples) if samples else None,
+        "mean_ms": statistics.fmean(samples) if samples else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--pdf", default="uploads/arpit_final_b.pdf")
+    parser.add_argument("--uploads", type=int, default=8, help="concurrent uploads")
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    parser.add_argument("--max-p95-ms", type=float, default=250.0, help="fail above this under-load p95")
+    args = parser.parse_args()
+
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+
+    # Baseline: idle server
+    stop = threading.Event()
+    baseline = []
+    t = threading.Thread(target=sample_ping, args=(args.url, stop, baseline))
+    t.start()
+    time.sleep(args.baseline_seconds)
+    stop.set()
+    t.join()
+
+    # Under load: keep pinging until every upload has returned
+    stop = threading.Event()
+    loaded = []
+    t = threading.Thread(target=sample_ping, args=(args.url, stop, loaded))
+    t.start()
+    workers = [
+        threading.Thread(target=upload, args=(args.url, pdf_bytes, f"load_{i}.pdf"))
+        for i in range(args.uploads)
+    ]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    t.join()
+
+    under_load = summarize(loaded)
+    passed = under_load["p95_ms"] is not None and under_load["p95_ms"] <= args.max_p95_ms
+    print(json.dumps({
+        "uploads": args.uploads,
+        "upload_wall_s": round(elapsed, 3),
+        "baseline": summarize(baseline),
+        "under_load": under_load,
+        "max_p95_ms": args.max_p95_ms,
+        "passed": passed,
+    }, indent=2))
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
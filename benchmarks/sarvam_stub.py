@@ -0,0 +1,137 @@
+"""
+Local stand-in for the Sarvam summary endpoint with injected latency and errors.
+
+    python -m benchmarks.sarvam_stub --port 8900 --latency-ms 300 --jitter-ms 100 --error-rate 0.05
+
+Point the backend at it with SARVAM_SUMMARY_URL=http://127.0.0.1:8900/summarize
+and any SARVAM_API_KEY. Every POST answers {"summary": ...} after the
+configured delay, except for the injected failures:
+
+    --error-rate     fraction answered with --error-status (default 503)
+    --timeout-rate   fraction that stall for --stall-s before answering
+    --garbage-rate   fraction answered 200 with a non-JSON body
+
+Outcomes are drawn from a seeded RNG, so a run is reproducible for a given
+request order. GET /stats returns the counts served so far.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    def __init__(self, latency_ms=200.0, jitter_ms=0.0, error_rate=0.0, error_status=503,
+                 timeout_rate=0.0, stall_s=30.0, garbage_rate=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.stall_s = stall_s
+        self.garbage_rate = garbage_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"ok": 0, "error": 0, "stall": 0, "garbage": 0}
+
+    def draw(self) -> tuple[str, float]:
+        """(outcome, delay seconds) for the next request."""
+        with self.lock:
+            r = self.rng.random()
+            delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms) / 1000) if self.jitter_ms else self.latency_ms / 1000
+            if r < self.error_rate:
+                outcome = "error"
+            elif r < self.error_rate + self.timeout_rate:
+                outcome, delay = "stall", self.stall_s
+            elif r < self.error_rate + self.timeout_rate + self.garbage_rate:
+                outcome = "garbage"
+            else:
+                outcome = "ok"
+            self.counts[outcome] += 1
+            return outcome, delay
+
+
+def make_handler(config: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with config.lock:
+                    self._send(200, json.dumps(config.counts).encode())
+            else:
+                self._send(404, b'{"detail": "not found"}')
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                text = json.loads(self.rfile.read(length) or b"{}").get("text", "")
+            except ValueError:
+                text = ""
+            outcome, delay = config.draw()
+            time.sleep(delay)
+            if outcome == "error":
+                self._send(config.error_status, b'{"detail": "injected error"}')
+            elif outcome == "garbage":
+                self._send(200, b"<html>upstream proxy error</html>", "text/html")
+            else:
+                words = text.split()
+                summary = f"Stub summary of {len(words)} words: " + " ".join(words[:20])
+                self._send(200, json.dumps({"summary": summary}).encode())
+
+    return Handler
+
+
+def start_stub(config: StubConfig, host="127.0.0.1", port=0) -> ThreadingHTTPServer:
+    """Serve on a daemon thread; ``server.server_address`` has the bound port."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--stall-s", type=float, default=30.0)
+    parser.add_argument("--garbage-rate", type=float, default=0.0)
+    parser.add_argument("--stub-seed", type=int, default=0)
+
+
+def config_from_args(args) -> StubConfig:
+    return StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+                      args.timeout_rate, args.stall_s, args.garbage_rate, args.stub_seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config_from_args(args)))
+    server.daemon_threads = True
+    print(f"Sarvam stub on http://{args.host}:{args.port}/summarize")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Full-text search latency on a synthetic resume corpus.
+
+    python benchmarks/search_latency.py --docs 100000
+
+Fills a temporary database with resume-like rows, builds the FTS5 index
+through the batched backfill, then times search_resumes() for a mix of
+common, rare and multi-term queries. Prints JSON.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionManager  # noqa: E402
+from search import create_fts, index_rows, search_resumes  # noqa: E402
+from content_store import register_functions, create_content_tables, compact_inline_content  # noqa: E402
+from benchmarks.synthetic_pdf import WORDS  # noqa: E402
+
+QUERIES = ["python", "kubernetes docker", "machine learning", "hackathon leadership", "skill0042", "rust"]
+
+
+def synthetic_text(rng, vocab, n_words):
+    # Each resume draws from its own handful of common words plus a long tail
+    # of rare "skills", so common terms match a fraction of the corpus, not all of it
+    profile = rng.sample(WORDS, 8)
+    return " ".join(rng.choice(profile) if rng.random() < 0.85 else rng.choice(vocab) for _ in range(n_words))
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of ``samples``; None when there are none."""
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=250, help="words per resume")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocab = [f"skill{i:04d}" for i in range(5000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "search.db"), on_connect=[register_functions])
+        with db.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE resumes (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT, "
+                "content TEXT, summary TEXT, uploaded_at TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO resumes (filename, content, summary, uploaded_at) VALUES (?, ?, ?, ?)",
+                (
+                    (f"r{i}.pdf", synthetic_text(rng, vocab, args.words), synthetic_text(rng, vocab, 20), "2024-01-01")
+                    for i in range(args.docs)
+                ),
+            )
+
+        # Same layout as the backend: compressed content tiers behind the index
+        with db.transaction() as conn:
+            create_content_tables(conn)
+        compact_inline_content(db)
+
+        t0 = time.perf_counter()
+        with db.transaction() as conn:
+            create_fts(conn)
+            indexed = index_rows(conn, 0, args.docs)
+        backfill_s = time.perf_counter() - t0
+
+        queries = {}
+        for q in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                hits = search_resumes(db, q, args.limit)
+                samples.append((time.perf_counter() - t) * 1000)
+            queries[q] = {
+                "hits_returned": len(hits),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+            }
+        db.close_all()
+
+    print(json.dumps({
+        "docs": args.docs,
+        "indexed": indexed,
+        "backfill_s": round(backfill_s, 2),
+        "queries": queries,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
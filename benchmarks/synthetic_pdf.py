@@ -0,0 +1,154 @@
+"""
+Minimal, dependency-free PDF writer for benchmark corpora.
+
+Produces valid single-font text PDFs that pdfplumber/PyPDF2 can extract,
+deterministically from a seed. ``resume_corpus()`` yields resume-like PDFs
+in several layouts and page counts; write one to disk with
+
+    python -m benchmarks.synthetic_pdf --out corpus/ --count 50 --seed 0
+"""
+import argparse
+import os
+import random
+
+WORDS = (
+    "python kubernetes docker fastapi sqlite streamlit pandas numpy react "
+    "typescript machine learning data engineering backend frontend cloud "
+    "internship hackathon project leadership analytics pipeline testing "
+    "research university bachelor technology experience skills developer"
+).split()
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_lines(rng: random.Random, n_lines: int, words_per_line: int = 10) -> list[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_line)) for _ in range(n_lines)]
+
+
+def _glyph_ops(line: str, x: float, y: float, advance: float) -> list[str]:
+    """One absolutely positioned show per character, as some exporters write text."""
+    return [
+        f"1 0 0 1 {x + i * advance:.1f} {y} Tm ({_escape(c)}) Tj"
+        for i, c in enumerate(line) if not c.isspace()
+    ]
+
+
+def build_pdf(pages: list[list[str]], font_size: int = 10, columns: int = 1, glyphs: bool = False) -> bytes:
+    """Assemble a PDF whose page ``i`` shows ``pages[i]`` as lines of text,
+    flowed top to bottom through ``columns`` side-by-side columns.
+
+    With ``glyphs`` every character is positioned on its own and spaces are
+    never drawn, so word breaks exist only as gaps between glyphs."""
+    objects = []  # object bodies, 1-indexed by position + 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # patched once the page tree exists
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    leading = font_size + 2
+    width = 495 // max(1, columns)
+    for lines in pages:
+        ops = []
+        per_column = -(-len(lines) // max(1, columns)) or 1
+        for col in range(max(1, columns)):
+            ops.append(f"BT /F1 {font_size} Tf {leading} TL {50 + col * width} 800 Td")
+            for row, line in enumerate(lines[col * per_column:(col + 1) * per_column]):
+                if glyphs:
+                    ops.extend(_glyph_ops(line, 50 + col * width, 800 - row * leading, font_size * 0.5))
+                else:
+                    ops.append(f"({_escape(line)}) Tj T*")
+            ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at)
+    return bytes(out)
+
+
+def make_pdf(n_pages: int, lines_per_page: int = 60, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    return build_pdf([page_lines(rng, lines_per_page) for _ in range(n_pages)])
+
+
+LAYOUTS = ("plain", "sectioned", "two_column")
+# Not drawn by resume_pdf(); ask for it explicitly (fast engines lose its word breaks)
+GLYPH_LAYOUT = "glyph_positioned"
+SECTIONS = ("EXPERIENCE", "EDUCATION", "PROJECTS", "SKILLS", "CERTIFICATIONS")
+FIRST_NAMES = ("Asha", "Rohan", "Meera", "Kabir", "Ishita", "Arjun", "Nisha", "Vikram")
+LAST_NAMES = ("Sharma", "Iyer", "Gupta", "Nair", "Reddy", "Khan", "Das", "Mehta")
+
+
+def resume_pages(rng: random.Random, n_pages: int, layout: str) -> tuple[list[list[str]], int]:
+    """Lines per page for one resume, and the number of text columns."""
+    if layout == "plain":
+        return [page_lines(rng, 60) for _ in range(n_pages)], 1
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    pages = []
+    for p in range(n_pages):
+        lines = [name.upper(), f"{name.split()[0].lower()}@example.com | +91 90000 {rng.randrange(10000, 99999)}", ""] if p == 0 else []
+        while len(lines) < 55:
+            lines.append(rng.choice(SECTIONS))
+            lines.extend("- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 9))) for _ in range(rng.randint(3, 7)))
+            lines.append("")
+        pages.append(lines[:60])
+    return pages, 2 if layout == "two_column" else 1
+
+
+def resume_pdf(seed: int, n_pages: int | None = None, layout: str | None = None) -> bytes:
+    """One resume-like PDF; page count and layout are drawn from ``seed`` unless given."""
+    rng = random.Random(seed)
+    if n_pages is None:
+        # Mostly one or two pages, with a tail of long CVs
+        n_pages = rng.choices((1, 2, 3, 5, 12, 30), weights=(40, 35, 12, 8, 4, 1))[0]
+    if layout is None:
+        layout = rng.choice(LAYOUTS)
+    glyphs = layout == GLYPH_LAYOUT
+    pages, columns = resume_pages(rng, n_pages, "sectioned" if glyphs else layout)
+    return build_pdf(pages, columns=columns, glyphs=glyphs)
+
+
+def resume_corpus(count: int, seed: int = 0):
+    """Yield ``(filename, pdf_bytes)`` for ``count`` deterministic resumes."""
+    for i in range(count):
+        yield f"resume_{seed}_{i:05d}.pdf", resume_pdf(seed * 1_000_003 + i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic resume corpus.")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    for name, data in resume_corpus(args.count, args.seed):
+        with open(os.path.join(args.out, name), "wb") as f:
+            f.write(data)
+    print(f"wrote {args.count} PDFs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
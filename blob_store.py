@@ -0,0 +1,182 @@
+# ================================
+#  Content-Addressed Upload Storage
+# ================================
+# Uploads are stored once per distinct content, named by their SHA-256:
+#   uploads/ab/cd/abcd...ef.pdf
+# Two levels of 256 shards keep every directory small (about 15 files per
+# leaf at a million uploads), a lookup is one stat() on a path computed from
+# the hash, and the path of a stored upload never changes. Files are
+# written to uploads/.incoming/ first and renamed into place, so readers
+# never see a partial blob and two uploads of the same bytes share one file.
+#
+# Nothing deletes a blob when a row goes away; gc() walks one leaf
+# directory at a time and removes blobs whose hash no resume row or pending
+# job refers to. Blobs modified within the grace period are kept, which
+# covers uploads that are stored but not inserted yet (commit() refreshes
+# the mtime when it reuses a blob).
+#
+#   python blob_store.py gc --db smartdocai.db --uploads uploads --dry-run
+#   python blob_store.py stats --uploads uploads
+import argparse
+import json
+import os
+import re
+import time
+import uuid
+
+HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+INCOMING = ".incoming"
+
+
+class BlobStore:
+    def __init__(self, root: str, suffix: str = ".pdf"):
+        self.root = root
+        self.suffix = suffix
+        os.makedirs(os.path.join(root, INCOMING), exist_ok=True)
+
+    def path_for(self, content_hash: str) -> str:
+        if not HASH_RE.match(content_hash):
+            raise ValueError(f"Not a sha256 hex digest: {content_hash!r}")
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash + self.suffix)
+
+    def staging_path(self) -> str:
+        """A fresh temp path on the same filesystem, so commit() is a rename."""
+        return os.path.join(self.root, INCOMING, uuid.uuid4().hex)
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self.path_for(content_hash))
+
+    def commit(self, tmp_path: str, content_hash: str) -> str:
+        """Move a spooled upload into place; returns its permanent path.
+
+        Same bytes already stored: the temp file is dropped and the existing
+        blob's mtime refreshed so gc() keeps it through the grace period.
+        """
+        path = self.path_for(content_hash)
+        if os.path.exists(path):
+            _remove(tmp_path)
+            os.utime(path)
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return path
+
+    def _dirs(self, path: str) -> list[str]:
+        try:
+            return sorted(e.name for e in os.scandir(path) if e.is_dir() and len(e.name) == 2)
+        except FileNotFoundError:
+            return []
+
+    def leaves(self):
+        """Yield ``(prefix, dir)`` for every leaf directory, in hash order."""
+        for a in self._dirs(self.root):
+            for b in self._dirs(os.path.join(self.root, a)):
+                yield a + b, os.path.join(self.root, a, b)
+
+    def blobs_in(self, leaf_dir: str):
+        """Yield ``(content_hash, os.DirEntry)`` for the blobs of one leaf directory."""
+        for entry in os.scandir(leaf_dir):
+            name = entry.name
+            if name.endswith(self.suffix) and HASH_RE.match(name[: -len(self.suffix)]):
+                yield name[: -len(self.suffix)], entry
+
+    def stats(self) -> dict:
+        blobs = size = leaves = 0
+        for _, leaf in self.leaves():
+            leaves += 1
+            for _, entry in self.blobs_in(leaf):
+                blobs += 1
+                size += entry.stat().st_size
+        return {"blobs": blobs, "bytes": size, "leaf_dirs": leaves}
+
+    def gc(self, db, grace_s: float = 86400.0, dry_run: bool = False) -> dict:
+        """Remove unreferenced blobs and stale temp files older than ``grace_s``."""
+        cutoff = time.time() - grace_s
+        pending = set()
+        with db.transaction() as conn:
+            # Queued and running jobs point at blobs that have no resume row yet
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone():
+                pending = {
+                    h for (h,) in conn.execute(
+                        "SELECT content_hash FROM jobs WHERE status IN ('queued', 'running') AND content_hash IS NOT NULL"
+                    )
+                }
+        out = {"scanned": 0, "removed": 0, "bytes_freed": 0, "kept_recent": 0, "incoming_removed": 0}
+        for prefix, leaf in self.leaves():
+            blobs = list(self.blobs_in(leaf))
+            if not blobs:
+                continue
+            # One index range scan per leaf instead of one query per blob
+            lo, hi = prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            referenced = {
+                h for (h,) in db.connection().execute(
+                    "SELECT content_hash FROM resumes WHERE content_hash >= ? AND content_hash < ?", (lo, hi)
+                )
+            }
+            for content_hash, entry in blobs:
+                out["scanned"] += 1
+                if content_hash in referenced or content_hash in pending:
+                    continue
+                # Fresh stat, not the cached one: a concurrent commit() may just have reused it
+                try:
+                    st = os.stat(entry.path)
+                except FileNotFoundError:
+                    continue
+                if st.st_mtime > cutoff:
+                    out["kept_recent"] += 1
+                    continue
+                out["removed"] += 1
+                out["bytes_freed"] += st.st_size
+                if not dry_run:
+                    _remove(entry.path)
+            if not dry_run:
+                try:
+                    os.rmdir(leaf)  # only succeeds once the leaf is empty
+                except OSError:
+                    pass
+        for entry in os.scandir(os.path.join(self.root, INCOMING)):
+            if entry.is_file() and entry.stat().st_mtime <= cutoff:
+                out["incoming_removed"] += 1
+                if not dry_run:
+                    _remove(entry.path)
+        return out
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main():
+    from db import ConnectionManager, sqlite_options_from_env
+
+    parser = argparse.ArgumentParser(description="Inspect or garbage-collect the upload blob store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gc = sub.add_parser("gc", help="remove blobs no resume or pending job refers to")
+    gc.add_argument("--db", default="smartdocai.db")
+    gc.add_argument("--grace-h", type=float, default=24.0, help="keep blobs modified this recently")
+    gc.add_argument("--dry-run", action="store_true")
+    stats = sub.add_parser("stats", help="count blobs and bytes")
+    for p in (gc, stats):
+        p.add_argument("--uploads", default="uploads")
+    args = parser.parse_args()
+
+    store = BlobStore(args.uploads)
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+        return
+    db = ConnectionManager(args.db, **sqlite_options_from_env())
+    try:
+        start = time.perf_counter()
+        result = store.gc(db, args.grace_h * 3600, args.dry_run)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        result["dry_run"] = args.dry_run
+        print(json.dumps(result, indent=2))
+    finally:
+        db.close_all()
+
+
+if __name__ == "__main__":
+    main()
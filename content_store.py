@@ -0,0 +1,143 @@
+# ================================
+#  Compressed Content Storage
+# ================================
+# Extracted text lives outside the resumes row, zlib-compressed, in one of
+# two tiers:
+#   resume_content       hot: recent resumes, fast compression level
+#   resume_content_cold  cold: resumes older than the archive age, recompressed
+#                        at the highest level
+# resumes.content is only non-NULL for rows written before this existed;
+# compact_inline_content() moves those out in batches. The resume_text view
+# (and the unz() SQL function it uses) gives one plain-text view over all
+# three places for the FTS index.
+import zlib
+
+CODEC_ZLIB = "zlib"
+HOT_LEVEL = 6
+COLD_LEVEL = 9
+
+
+def compress_text(text: str, level: int = HOT_LEVEL) -> tuple[str, bytes]:
+    return CODEC_ZLIB, zlib.compress(text.encode("utf-8"), level)
+
+
+def decompress_text(codec: str | None, data: bytes | None) -> str | None:
+    if data is None:
+        return None
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown content codec: {codec}")
+
+
+def register_functions(conn):
+    """ConnectionManager on_connect hook: expose unz(codec, data) to SQL."""
+    conn.create_function("unz", 2, decompress_text, deterministic=True)
+
+
+def create_content_tables(conn):
+    """Schema step of the content_tiers migration (migrations.py)."""
+    for table in ("resume_content", "resume_content_cold"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                resume_id INTEGER PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL
+            )
+            """
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_uploaded_at ON resumes (uploaded_at)")
+    # Keeps the "any inline content left?" check cheap once compaction is done
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_inline_content ON resumes (id) WHERE content IS NOT NULL")
+    conn.execute(
+        """
+        CREATE VIEW IF NOT EXISTS resume_text AS
+        SELECT r.id AS id,
+               COALESCE(r.content, unz(h.codec, h.data), unz(c.codec, c.data)) AS content,
+               r.summary AS summary
+        FROM resumes r
+        LEFT JOIN resume_content h ON h.resume_id = r.id
+        LEFT JOIN resume_content_cold c ON c.resume_id = r.id
+        """
+    )
+
+
+def store_content(conn, resume_id: int, text: str):
+    """Write a resume's text to the hot tier (caller owns the transaction)."""
+    codec, data = compress_text(text)
+    conn.execute(
+        "INSERT OR REPLACE INTO resume_content (resume_id, codec, data) VALUES (?, ?, ?)",
+        (resume_id, codec, data),
+    )
+
+
+def replace_content(conn, resume_id: int, text: str):
+    """Overwrite a stored resume's text, wherever it lived, in the hot tier
+    (caller owns the transaction)."""
+    conn.execute("UPDATE resumes SET content = NULL WHERE id = ? AND content IS NOT NULL", (resume_id,))
+    conn.execute("DELETE FROM resume_content_cold WHERE resume_id = ?", (resume_id,))
+    store_content(conn, resume_id, text)
+
+
+def load_content(conn, resume_id: int) -> str | None:
+    """Decompress one resume's text from whichever tier holds it."""
+    row = conn.execute("SELECT content FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+    if row and row[0] is not None:
+        return row[0]
+    for table in ("resume_content", "resume_content_cold"):
+        hit = conn.execute(f"SELECT codec, data FROM {table} WHERE resume_id = ?", (resume_id,)).fetchone()
+        if hit:
+            return decompress_text(*hit)
+    return None
+
+
+def compact_inline_content(db, batch_size: int = 500) -> int:
+    """Move legacy inline resumes.content into the hot tier, one committed batch at a time."""
+    moved = 0
+    while True:
+        with db.transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, content FROM resumes WHERE content IS NOT NULL ORDER BY id LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            if not rows:
+                return moved
+            for resume_id, text in rows:
+                store_content(conn, resume_id, text)
+            conn.executemany("UPDATE resumes SET content = NULL WHERE id = ?", [(r[0],) for r in rows])
+            moved += len(rows)
+
+
+def archive_older_than(db, cutoff_iso: str, batch_size: int = 200) -> int:
+    """Recompress hot content of resumes uploaded before ``cutoff_iso`` into the cold tier."""
+    moved = 0
+    while True:
+        with db.transaction() as conn:
+            rows = conn.execute(
+                """
+                SELECT h.resume_id, h.codec, h.data
+                FROM resume_content h JOIN resumes r ON r.id = h.resume_id
+                WHERE r.uploaded_at < ?
+                LIMIT ?
+                """,
+                (cutoff_iso, batch_size),
+            ).fetchall()
+            if not rows:
+                return moved
+            cold = [(rid, *compress_text(decompress_text(codec, data), COLD_LEVEL)) for rid, codec, data in rows]
+            conn.executemany(
+                "INSERT OR REPLACE INTO resume_content_cold (resume_id, codec, data) VALUES (?, ?, ?)",
+                cold,
+            )
+            conn.executemany("DELETE FROM resume_content WHERE resume_id = ?", [(r[0],) for r in rows])
+            moved += len(rows)
+
+
+def tier_stats(db) -> dict:
+    conn = db.connection()
+    stats = {}
+    for tier, table in (("hot", "resume_content"), ("cold", "resume_content_cold")):
+        count, size = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM {table}").fetchone()
+        stats[tier] = {"rows": count, "compressed_bytes": size}
+    stats["inline"] = {"rows": conn.execute("SELECT COUNT(*) FROM resumes WHERE content IS NOT NULL").fetchone()[0]}
+    return stats
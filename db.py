@@ -0,0 +1,134 @@
+# ================================
+#  SQLite Connection Manager
+# ================================
+# One long-lived connection per thread instead of connect/close per call.
+# Every connection runs in WAL mode (readers don't block on the writer) with
+# tuned pragmas and a prepared-statement cache.
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def sqlite_options_from_env() -> dict:
+    """
+    Read connection tuning from the environment (all optional):
+      SMARTDOCAI_SQLITE_BUSY_TIMEOUT_MS=5000
+      SMARTDOCAI_SQLITE_SYNCHRONOUS=NORMAL
+      SMARTDOCAI_SQLITE_CACHE_SIZE=-20000       # negative = KiB, positive = pages
+      SMARTDOCAI_SQLITE_MMAP_SIZE=268435456     # bytes
+      SMARTDOCAI_SQLITE_CACHED_STATEMENTS=256
+    """
+    return {
+        "busy_timeout_ms": int(os.getenv("SMARTDOCAI_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "synchronous": os.getenv("SMARTDOCAI_SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": int(os.getenv("SMARTDOCAI_SQLITE_CACHE_SIZE", "-20000")),
+        "mmap_size": int(os.getenv("SMARTDOCAI_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "cached_statements": int(os.getenv("SMARTDOCAI_SQLITE_CACHED_STATEMENTS", "256")),
+    }
+
+
+class _ThreadConnection:
+    """Holds one thread's connection; closes it when the thread's locals are dropped."""
+
+    def __init__(self, manager: "ConnectionManager", conn: sqlite3.Connection):
+        self.manager = manager
+        self.conn = conn
+
+    def __del__(self):
+        self.manager._discard(self.conn)
+
+
+class ConnectionManager:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        busy_timeout_ms: int = 5000,
+        synchronous: str = "NORMAL",
+        cache_size: int = -20000,
+        mmap_size: int = 256 * 1024 * 1024,
+        cached_statements: int = 256,
+        wal: bool = True,
+        on_connect=(),
+    ):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {sorted(SYNCHRONOUS_MODES)}")
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.wal = wal
+        self.on_connect = list(on_connect)  # callables run on every new connection, e.g. create_function
+        self._local = threading.local()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,  # only so close_all() can run from another thread
+        )
+        if self.wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        for hook in self.on_connect:
+            hook(conn)
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use. Do not close it."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnection(self, self._open())
+        return holder.conn
+
+    def open_dedicated(self) -> sqlite3.Connection:
+        """A new connection outside the per-thread pool, for long-lived cursors
+        (e.g. streaming) that may be resumed from different threads. Caller closes it."""
+        conn = self._open()
+        with self._lock:
+            self._all.remove(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def transaction(self):
+        """Yield this thread's connection; commit on success, roll back on error."""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close_all(self):
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
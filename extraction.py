@@ -0,0 +1,180 @@
+# ================================
+#  PDF Text Extraction
+# ================================
+# Plain functions with picklable arguments so they can run in worker
+# processes. backend.py decides where each call runs.
+#
+# Extraction engines are registered by name in ENGINES. extract_pages_chain()
+# runs a chain of them in order, fastest first, and keeps the first result
+# that passes quality_problem(); the last engine in the chain is the
+# layout-aware fallback and is always accepted.
+import time
+import unicodedata
+
+import pdfplumber
+
+DEFAULT_CHAIN = ("pypdf2", "pdfplumber")
+# Stored with each resume; bump when a change alters extracted text, so
+# older rows can be selected for re-extraction (see reprocess.py)
+EXTRACTOR_VERSION = 2
+MIN_CHARS_PER_PAGE = 50       # below this the page is likely image-only or mis-decoded
+MAX_MEAN_TOKEN_LEN = 12       # longer average "words" mean the engine dropped spaces
+MAX_GARBLED_RATIO = 0.02      # share of control / replacement / private-use characters
+MIN_LETTER_RATIO = 0.5        # share of letters among non-space characters
+
+
+class PdfEngine:
+    """One extraction backend. ``source`` is a path or an open binary handle."""
+
+    name = ""
+
+    def pages(self, source) -> list[str]:
+        raise NotImplementedError
+
+    def count_pages(self, source) -> int:
+        return len(self.pages(source))
+
+    def page_range(self, source, start: int, stop: int) -> list[str]:
+        return self.pages(source)[start:stop]
+
+
+class PdfplumberEngine(PdfEngine):
+    """Layout-aware: rebuilds words and lines from glyph positions. Slow."""
+
+    name = "pdfplumber"
+
+    def pages(self, source):
+        with pdfplumber.open(source) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+
+    def count_pages(self, source):
+        with pdfplumber.open(source) as pdf:
+            return len(pdf.pages)
+
+    def page_range(self, source, start, stop):
+        with pdfplumber.open(source) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+class PyPDF2Engine(PdfEngine):
+    """Content-stream order text; fast on simple PDFs, loses spacing on
+    glyph-positioned ones."""
+
+    name = "pypdf2"
+
+    def _reader(self, source):
+        import PyPDF2  # optional: only needed when this engine is in the chain
+
+        return PyPDF2.PdfReader(source)
+
+    def pages(self, source):
+        return [page.extract_text() or "" for page in self._reader(source).pages]
+
+    def count_pages(self, source):
+        return len(self._reader(source).pages)
+
+    def page_range(self, source, start, stop):
+        return [page.extract_text() or "" for page in self._reader(source).pages[start:stop]]
+
+
+ENGINES: dict[str, PdfEngine] = {}
+
+
+def register_engine(engine: PdfEngine):
+    ENGINES[engine.name] = engine
+
+
+register_engine(PyPDF2Engine())
+register_engine(PdfplumberEngine())
+
+
+def quality_problem(pages: list[str]) -> str | None:
+    """Why an extraction looks unusable, or None if it looks fine."""
+    text = "".join(pages)
+    visible = [c for c in text if not c.isspace()]
+    if len(visible) < MIN_CHARS_PER_PAGE * max(1, len(pages)):
+        return "too_little_text"
+    if "(cid:" in text:
+        return "garbled"
+    bad = sum(1 for c in visible if c == "�" or unicodedata.category(c) in ("Cc", "Cf", "Co", "Cs"))
+    if bad / len(visible) > MAX_GARBLED_RATIO:
+        return "garbled"
+    if sum(1 for c in visible if c.isalpha()) / len(visible) < MIN_LETTER_RATIO:
+        return "garbled"
+    tokens = text.split()
+    if sum(len(t) for t in tokens) / len(tokens) > MAX_MEAN_TOKEN_LEN:
+        return "missing_spaces"
+    return None
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def extract_pages_chain(source, chain=DEFAULT_CHAIN, skip_last: bool = False) -> tuple[list[str] | None, list[dict]]:
+    """Run engines in ``chain`` order until one gives acceptable text.
+
+    Returns ``(pages, attempts)``; each attempt is ``{"engine", "seconds",
+    "accepted", "reason"}``. With ``skip_last`` the final (fallback) engine
+    is not run and ``pages`` is None when every earlier engine was rejected,
+    so the caller can run the fallback its own way (e.g. page-sharded).
+    An error from a non-final engine counts as a rejection.
+    """
+    attempts = []
+    for i, name in enumerate(chain):
+        last = i == len(chain) - 1
+        if last and skip_last:
+            break
+        _rewind(source)
+        start = time.perf_counter()
+        try:
+            pages = ENGINES[name].pages(source)
+            reason = None if last else quality_problem(pages)
+        except Exception as e:
+            if last:
+                raise
+            pages, reason = None, f"error:{type(e).__name__}"
+        attempts.append({
+            "engine": name,
+            "seconds": round(time.perf_counter() - start, 4),
+            "accepted": reason is None,
+            "reason": reason,
+        })
+        if reason is None:
+            return pages, attempts
+    return None, attempts
+
+
+def join_pages(page_texts) -> str:
+    """Join per-page text in order, one newline after each page."""
+    return "".join(t + "\n" for t in page_texts)
+
+
+def extract_pdf_text(source, chain=DEFAULT_CHAIN) -> str:
+    """Extract text from every page through the engine chain, joined with join_pages()."""
+    pages, _ = extract_pages_chain(source, chain)
+    return join_pages(pages)
+
+
+def count_pdf_pages(source, engine: str = "pdfplumber") -> int:
+    return ENGINES[engine].count_pages(source)
+
+
+def extract_page_range(file_path: str, start: int, stop: int, engine: str = "pdfplumber") -> list[str]:
+    """Extract pages [start, stop) of one PDF; one shard of a parallel extraction."""
+    return ENGINES[engine].page_range(file_path, start, stop)
+
+
+def shard_ranges(n_pages: int, n_shards: int) -> list[tuple[int, int]]:
+    """Split [0, n_pages) into at most ``n_shards`` contiguous, near-equal ranges."""
+    n_shards = max(1, min(n_shards, n_pages))
+    base, extra = divmod(n_pages, n_shards)
+    ranges = []
+    start = 0
+    for i in range(n_shards):
+        stop = start + base + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
@@ -0,0 +1,95 @@
+# ================================
+#  Resume Jobs
+# ================================
+# SQLite-backed job records for asynchronous uploads. The queue itself is
+# in-process (backend.py); this table is the source of truth, so jobs that
+# were queued or running when the process stopped are picked up on restart.
+import json
+import uuid
+from datetime import datetime
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def create_table(conn):
+    """Schema step of the jobs migration (migrations.py)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            filename TEXT,
+            filepath TEXT,
+            content_hash TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+
+class JobStore:
+    def __init__(self, db):
+        self.db = db
+
+    def create(self, filename: str, filepath: str, content_hash: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = datetime.utcnow().isoformat()
+        with self.db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO jobs (id, status, filename, filepath, content_hash, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, QUEUED, filename, filepath, content_hash, now, now),
+            )
+        return job_id
+
+    def set_status(self, job_id: str, status: str, result: dict | None = None, error: str | None = None):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    datetime.utcnow().isoformat(),
+                    job_id,
+                ),
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        row = self.db.connection().execute(
+            """
+            SELECT id, status, filename, filepath, content_hash, result, error, created_at, updated_at
+            FROM jobs WHERE id = ?
+            """,
+            (job_id,),
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "filename": row[2],
+            "filepath": row[3],
+            "content_hash": row[4],
+            "result": json.loads(row[5]) if row[5] else None,
+            "error": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+
+    def pending_ids(self) -> list[str]:
+        """Jobs that never finished (queued, or running when the process stopped), oldest first."""
+        rows = self.db.connection().execute(
+            "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (QUEUED, RUNNING),
+        ).fetchall()
+        return [r[0] for r in rows]
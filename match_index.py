@@ -0,0 +1,230 @@
+# ================================
+#  Job-Description Matching
+# ================================
+# Sparse term-frequency matrix over every stored resume, kept as append-only
+# flat files and memory-mapped for scoring. Rows are in CSR form:
+#   ends.i8      end offset of each row in terms/tf (row count = file length)
+#   terms.i4     term id of each non-zero entry
+#   tf.f4        term frequency of each non-zero entry
+#   lengths.f4   token count of each row (BM25 length normalization)
+#   ids.i8       resume id of each row
+# ends is written last, so a crash mid-append leaves a shorter but consistent
+# matrix; the excess tail is trimmed on the next append. Rows are appended in
+# resume id order, so the last indexed id doubles as the backfill watermark.
+# Term ids live in the match_terms table.
+#
+# Scoring is Okapi BM25. Document frequencies are counted from the matched
+# entries at query time, so appends never rewrite existing rows. One process
+# owns the files; readers in that process remap when the row count changes.
+import os
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]+")
+K1 = 1.2
+B = 0.75
+SCAN_CHUNK = 1 << 23  # entries per masked gather, bounds temporary memory
+
+_FILES = {"ends": "<i8", "terms": "<i4", "tf": "<f4", "lengths": "<f4", "ids": "<i8"}
+
+
+def tokenize(text: str) -> Counter:
+    return Counter(TOKEN_RE.findall(text.lower()))
+
+
+def create_table(conn):
+    """Schema step of the match_terms migration (migrations.py)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_terms (
+            term TEXT PRIMARY KEY,
+            term_id INTEGER NOT NULL UNIQUE
+        ) WITHOUT ROWID
+        """
+    )
+
+
+class MatchIndex:
+    def __init__(self, db, path: str):
+        self.db = db
+        self.path = path
+        self._vocab: dict[str, int] | None = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._maps: dict | None = None
+
+    def load(self):
+        """Create the matrix directory and read the term ids (match_terms must exist)."""
+        os.makedirs(self.path, exist_ok=True)
+        self._vocab = dict(self.db.connection().execute("SELECT term, term_id FROM match_terms").fetchall())
+
+    # ---------- files ----------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.{_FILES[name][1:]}")
+
+    def _count(self, name: str) -> int:
+        try:
+            return os.path.getsize(self._file(name)) // np.dtype(_FILES[name]).itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _read(self, name: str, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=_FILES[name])
+        return np.memmap(self._file(name), dtype=_FILES[name], mode="r", shape=(count,))
+
+    def _trim(self) -> tuple[int, int]:
+        """Cut any partially appended tail; returns (rows, entries)."""
+        rows = self._count("ends")
+        entries = int(self._read("ends", rows)[-1]) if rows else 0
+        for name, keep in (("terms", entries), ("tf", entries), ("lengths", rows), ("ids", rows)):
+            if self._count(name) != keep:
+                with open(self._file(name), "ab") as f:
+                    f.truncate(keep * np.dtype(_FILES[name]).itemsize)
+        return rows, entries
+
+    def last_id(self) -> int:
+        rows = self._count("ends")
+        return int(self._read("ids", rows)[-1]) if rows and self._count("ids") >= rows else 0
+
+    # ---------- writes ----------
+    def _term_ids(self, terms) -> dict[str, int]:
+        """Ids for ``terms``, assigning new ones; committed before any row uses them."""
+        new = [t for t in terms if t not in self._vocab]
+        if new:
+            start = len(self._vocab)
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO match_terms (term, term_id) VALUES (?, ?)",
+                    ((t, start + i) for i, t in enumerate(new)),
+                )
+            self._vocab.update((t, start + i) for i, t in enumerate(new))
+        return self._vocab
+
+    def append(self, docs: list[tuple[int, str]]):
+        """Append (resume_id, text) rows; ids must be above last_id()."""
+        if not docs:
+            return
+        counts = [tokenize(text or "") for _, text in docs]
+        vocab = self._term_ids({t for c in counts for t in c})
+        _, entries = self._trim()
+        ends, terms, tf, lengths = [], [], [], []
+        for c in counts:
+            entries += len(c)
+            ends.append(entries)
+            terms.extend(vocab[t] for t in c)
+            tf.extend(c.values())
+            lengths.append(sum(c.values()))
+        columns = {
+            "terms": terms,
+            "tf": tf,
+            "lengths": lengths,
+            "ids": [resume_id for resume_id, _ in docs],
+            "ends": ends,  # last: makes the rows visible
+        }
+        for name, values in columns.items():
+            with open(self._file(name), "ab") as f:
+                f.write(np.asarray(values, dtype=_FILES[name]).tobytes())
+
+    def _drain(self, batch_size: int) -> int:
+        total = 0
+        while True:
+            rows = self.db.connection().execute(
+                "SELECT id, content FROM resume_text WHERE id > ? ORDER BY id LIMIT ?",
+                (self.last_id(), batch_size),
+            ).fetchall()
+            if not rows:
+                return total
+            self.append(rows)
+            total += len(rows)
+
+    def sync(self, batch_size: int = 500) -> int:
+        """Append every stored resume not yet in the matrix; returns rows added.
+
+        Safe to call after each insert: if another thread is already syncing
+        it returns at once and that thread picks the new rows up."""
+        total = 0
+        self._dirty = True
+        while self._dirty:
+            if not self._lock.acquire(blocking=False):
+                return total
+            try:
+                self._dirty = False
+                total += self._drain(batch_size)
+            finally:
+                self._lock.release()
+        return total
+
+    # ---------- reads ----------
+    def _snapshot(self) -> dict | None:
+        rows = self._count("ends")
+        if self._maps is None or self._maps["rows"] != rows:
+            if rows == 0:
+                return None
+            ends = self._read("ends", rows)
+            entries = int(ends[-1])
+            if self._count("terms") < entries or self._count("ids") < rows:
+                return self._maps  # mid-append; keep the previous view
+            self._maps = {
+                "rows": rows,
+                "ends": ends,
+                "terms": self._read("terms", entries),
+                "tf": self._read("tf", entries),
+                "lengths": self._read("lengths", rows),
+                "ids": self._read("ids", rows),
+            }
+        return self._maps
+
+    def stats(self) -> dict:
+        snap = self._snapshot()
+        return {
+            "documents": snap["rows"] if snap else 0,
+            "entries": len(snap["terms"]) if snap else 0,
+            "terms": len(self._vocab or ()),
+        }
+
+    def top_k(self, text: str, k: int = 10) -> list[dict]:
+        """BM25 score of every indexed resume against ``text``; best ``k`` first."""
+        snap = self._snapshot()
+        query = tokenize(text)
+        if snap is None or not query:
+            return []
+        known = {self._vocab[t]: n for t, n in query.items() if t in self._vocab}
+        if not known:
+            return []
+        # Every stored term id was assigned before its row was written
+        lookup = np.zeros(len(self._vocab), dtype=bool)
+        lookup[list(known)] = True
+
+        terms, tf, ends = snap["terms"], snap["tf"], snap["ends"]
+        hits = []
+        for start in range(0, len(terms), SCAN_CHUNK):
+            hits.append(np.flatnonzero(lookup[terms[start:start + SCAN_CHUNK]]) + start)
+        hits = np.concatenate(hits)
+        if hits.size == 0:
+            return []
+
+        rows = np.searchsorted(ends, hits, side="right")
+        hit_terms = np.asarray(terms[hits])
+        hit_tf = np.asarray(tf[hits], dtype=np.float64)
+        lengths = np.asarray(snap["lengths"], dtype=np.float64)
+        n_docs = len(lengths)
+
+        # Each term appears at most once per row, so entries per term = document frequency
+        uniq, inverse, df = np.unique(hit_terms, return_inverse=True, return_counts=True)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        weight = idf * np.array([known[int(t)] for t in uniq], dtype=np.float64)
+        norm = K1 * (1 - B + B * lengths[rows] / max(lengths.mean(), 1.0))
+        contrib = weight[inverse] * hit_tf * (K1 + 1) / (hit_tf + norm)
+        scores = np.bincount(rows, weights=contrib, minlength=n_docs)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        ids = snap["ids"]
+        return [{"id": int(ids[i]), "score": round(float(scores[i]), 4)} for i in best]
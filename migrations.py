@@ -0,0 +1,438 @@
+# ================================
+#  Schema Migrations
+# ================================
+# The resumes table is shared by app.py, backend.py and backend/backend.py,
+# which used to create and patch it three different ways on every start.
+# Its schema is owned here instead. MIGRATIONS are applied in version order
+# and recorded in schema_version, so once a database is current a process
+# start costs one SELECT.
+#
+# Every table the backends share is created here, including the derived
+# ones (content tiers, search index, term statistics, MinHash buckets);
+# their modules provide the schema and rewrite functions registered below.
+#
+# A migration has a schema step (short DDL, run at startup under a write
+# lock, safe to re-run on databases that already have the change) and/or a
+# row rewrite. Rewrites never run inside the schema step: they are queued in
+# schema_backfill and run_backfills() converts rows in small committed id
+# ranges, so a large table is migrated while uploads keep writing. Rows
+# inserted after the migration is applied are already written in the new
+# form. Until a rewrite finishes, readers go through decode_top_words() and
+# decode_used_fallback(), which accept the old and the new form.
+#
+# The derived tables are different: backend.py indexes its rows in the same
+# transaction as the insert, but app.py and backend/backend.py write plain
+# rows. Their rewrites "follow" the table: every run_backfills() raises
+# upto_id to the current max id, and the rewrite skips rows that are already
+# indexed (checked as it writes), so whichever process wrote a row, it is
+# indexed exactly once.
+#
+#   python migrations.py --db smartdocai.db            # apply + backfill
+#   python migrations.py --db smartdocai.db --status
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+
+import jobs
+import match_index
+import near_dup
+import search
+import summary_cache
+import term_stats
+from content_store import create_content_tables, register_functions
+from response_cache import create_table_versions
+
+DEFAULT_BATCH = 500
+
+
+class Migration:
+    def __init__(self, version: int, name: str, schema=None, rewrite=None, table: str = "resumes",
+                 follow: bool = False):
+        self.version = version
+        self.name = name
+        self.schema = schema      # schema(conn): DDL only, idempotent; may return the
+                                  # (done_id, upto_id) range left for the rewrite
+        self.rewrite = rewrite    # rewrite(conn, after_id, upto_id) -> rows changed
+        self.table = table        # table whose id ranges the rewrite walks
+        self.follow = follow      # rewrite also covers rows inserted later (idempotent rewrites only)
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _create_resumes(conn):
+    # The oldest shape (backend/backend.py); later columns are added by v2
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resumes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filename TEXT,
+            content TEXT
+        )
+        """
+    )
+
+
+RESUME_COLUMNS = (
+    ("filepath", "TEXT"),
+    ("summary", "TEXT"),
+    ("top_words", "TEXT"),
+    ("uploaded_at", "TEXT"),
+    ("used_fallback", "INTEGER"),
+    ("content_hash", "TEXT"),
+)
+
+
+def _resume_columns(conn):
+    # ADD COLUMN only rewrites the schema, not the rows, so it is instant at any size
+    have = _columns(conn, "resumes")
+    for name, decl in RESUME_COLUMNS:
+        if name not in have:
+            conn.execute(f"ALTER TABLE resumes ADD COLUMN {name} {decl}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes (content_hash)")
+
+
+def decode_top_words(value) -> list[str]:
+    """top_words as stored: a JSON list, or (app.py rows) comma-joined words."""
+    if not value:
+        return []
+    if value.startswith("["):
+        try:
+            words = json.loads(value)
+        except ValueError:
+            words = None
+        if isinstance(words, list):
+            return [str(w) for w in words]
+    return [w for w in value.split(",") if w]
+
+
+def decode_used_fallback(value) -> bool:
+    """used_fallback as stored: 0/1, or (app.py rows) the text 'True'/'False'.
+
+    Columns created by app.py have TEXT affinity, so even 0/1 read back as
+    '0'/'1'; plain bool() would call '0' true.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true")
+    return bool(value)
+
+
+def _normalize_legacy_values(conn, after_id: int, upto_id: int) -> int:
+    """Store top_words as a JSON list and used_fallback as 0/1 for ids in (after_id, upto_id]."""
+    rows = conn.execute(
+        "SELECT id, top_words, used_fallback FROM resumes WHERE id > ? AND id <= ?",
+        (after_id, upto_id),
+    ).fetchall()
+    changes = []
+    for resume_id, top_words, used_fallback in rows:
+        new_words = json.dumps(decode_top_words(top_words)) if top_words is not None else None
+        new_fallback = int(decode_used_fallback(used_fallback)) if used_fallback is not None else None
+        # TEXT-affinity columns hand back '0'/'1' for stored integers; those are already normalized
+        if new_words != top_words or str(new_fallback) != str(used_fallback):
+            changes.append((new_words, new_fallback, resume_id))
+    if changes:
+        conn.executemany("UPDATE resumes SET top_words = ?, used_fallback = ? WHERE id = ?", changes)
+    return len(changes)
+
+
+def _resume_extractor(conn):
+    # Which engine produced the stored text, and extraction.EXTRACTOR_VERSION
+    # at the time; NULL for rows stored before either was recorded
+    have = _columns(conn, "resumes")
+    for name, decl in (("extractor", "TEXT"), ("extractor_version", "INTEGER")):
+        if name not in have:
+            conn.execute(f"ALTER TABLE resumes ADD COLUMN {name} {decl}")
+
+
+def _reprocess_runs(conn):
+    # Checkpoints of reprocess.py runs, one row per --run name
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reprocess_runs (
+            name TEXT PRIMARY KEY,
+            spec TEXT NOT NULL,
+            done_id INTEGER NOT NULL,
+            upto_id INTEGER NOT NULL,
+            rows_done INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _take_legacy_backfill(conn, table: str) -> tuple[int, int] | None:
+    """Progress of a singleton backfill table from before these indexes were
+    migrations (fts_backfill etc.); the table is dropped."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+        return None
+    row = conn.execute(f"SELECT done_id, upto_id FROM {table} WHERE id = 1").fetchone()
+    conn.execute(f"DROP TABLE {table}")
+    return tuple(row) if row else None
+
+
+def _index_schema(create, legacy_table: str):
+    """Schema step for an index over resumes: every row is left to index if
+    ``create`` made it empty, else whatever its old backfill had not reached."""
+    def schema(conn):
+        created = create(conn)
+        legacy = _take_legacy_backfill(conn, legacy_table)
+        upto = conn.execute("SELECT COALESCE(MAX(id), 0) FROM resumes").fetchone()[0]
+        if created:
+            return 0, upto
+        return legacy or (upto, upto)
+    return schema
+
+
+def _term_stats_docs(conn):
+    term_stats.create_doc_table(conn)
+    # Rows the aggregates already count: those the term_stats backfill has
+    # passed, and above its range those backend.py stored (it counted every
+    # row it inserted and is the only writer that sets content_hash)
+    state = backfill_state(conn, "term_stats")
+    if state:
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO term_stats_docs (resume_id)
+            SELECT id FROM resumes WHERE id <= ? OR (id > ? AND content_hash IS NOT NULL)
+            """,
+            state,
+        )
+
+
+# Updates that bump the resumes version (ETag / Last-Modified of /insights)
+RESUME_VERSION_COLUMNS = ("filename", "filepath", "summary", "top_words", "uploaded_at", "used_fallback")
+
+
+def _resume_versions(conn):
+    create_table_versions(conn, "resumes", RESUME_VERSION_COLUMNS)
+
+
+MIGRATIONS = (
+    Migration(1, "create_resumes", schema=_create_resumes),
+    Migration(2, "resume_columns", schema=_resume_columns),
+    Migration(3, "normalize_legacy_values", rewrite=_normalize_legacy_values),
+    Migration(4, "resume_extractor", schema=_resume_extractor),
+    Migration(5, "content_tiers", schema=create_content_tables),
+    Migration(
+        6, "resumes_fts",
+        schema=_index_schema(search.create_fts, "fts_backfill"), rewrite=search.index_rows, follow=True,
+    ),
+    Migration(
+        7, "term_stats",
+        schema=_index_schema(term_stats.create_term_tables, "term_stats_backfill"), rewrite=term_stats.count_rows,
+        follow=True,
+    ),
+    Migration(
+        8, "minhash",
+        schema=_index_schema(near_dup.create_minhash_tables, "minhash_backfill"), rewrite=near_dup.sign_rows,
+        follow=True,
+    ),
+    Migration(9, "summary_cache", schema=summary_cache.create_table),
+    Migration(10, "jobs", schema=jobs.create_table),
+    Migration(11, "match_terms", schema=match_index.create_table),
+    Migration(12, "resume_versions", schema=_resume_versions),
+    Migration(13, "reprocess_runs", schema=_reprocess_runs),
+    Migration(14, "term_stats_docs", schema=_term_stats_docs),
+)
+
+
+def init_schema_tables(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_backfill (
+            version INTEGER PRIMARY KEY,
+            done_id INTEGER NOT NULL,
+            upto_id INTEGER NOT NULL
+        )
+        """
+    )
+
+
+def current_version(conn) -> int:
+    row = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()
+    return row[0]
+
+
+def migrate(db, migrations=MIGRATIONS) -> list[int]:
+    """Apply pending schema steps in order and queue their rewrites; returns versions applied.
+
+    Each migration commits on its own under BEGIN IMMEDIATE, re-reading the
+    version inside the lock, so processes starting together apply it once.
+    """
+    with db.transaction() as conn:
+        init_schema_tables(conn)
+        if current_version(conn) >= migrations[-1].version:
+            return []
+    applied = []
+    for m in migrations:
+        with db.transaction() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if current_version(conn) >= m.version:
+                continue
+            pending = m.schema(conn) if m.schema is not None else None
+            if m.rewrite is not None:
+                if pending is None:
+                    # Rows above the current max are written in the new form already
+                    upto = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {m.table}").fetchone()[0]
+                    pending = (0, upto)
+                conn.execute(
+                    "INSERT OR REPLACE INTO schema_backfill (version, done_id, upto_id) VALUES (?, ?, ?)",
+                    (m.version, *pending),
+                )
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (m.version, m.name, datetime.utcnow().isoformat()),
+            )
+            applied.append(m.version)
+    return applied
+
+
+def run_backfills(db, batch_size: int = DEFAULT_BATCH, pause_s: float = 0.0, migrations=MIGRATIONS) -> int:
+    """Run queued rewrites in id-range batches, committing after each; returns rows changed.
+
+    Resumable: progress is kept in schema_backfill, so a restart continues
+    after the last committed batch. Following rewrites first extend their
+    range to the rows inserted since the last call. ``pause_s`` sleeps
+    between batches to leave the write lock free for uploads.
+
+    Callers may run concurrently (threads or processes). Reads happen before
+    the write lock is taken, so a batch commits only if its range is still
+    unclaimed; following rewrites also re-check each row as they write it.
+    """
+    by_version = {m.version: m for m in migrations if m.rewrite is not None}
+    marks = ", ".join("?" for _ in by_version)
+    # Index rewrites read the resume_text view, which needs unz()
+    register_functions(db.connection())
+    with db.transaction() as conn:
+        for m in by_version.values():
+            if m.follow:
+                conn.execute(
+                    f"UPDATE schema_backfill SET upto_id = (SELECT COALESCE(MAX(id), 0) FROM {m.table}) WHERE version = ?",
+                    (m.version,),
+                )
+    total = 0
+    while True:
+        with db.transaction() as conn:
+            state = conn.execute(
+                f"""
+                SELECT version, done_id, upto_id FROM schema_backfill
+                WHERE done_id < upto_id AND version IN ({marks}) ORDER BY version LIMIT 1
+                """,
+                list(by_version),
+            ).fetchone()
+            if not state:
+                return total
+            version, done_id, upto_id = state
+            m = by_version[version]
+            # Upper id of this batch: the batch_size-th row after done_id, or the end of the range
+            row = conn.execute(
+                f"SELECT id FROM {m.table} WHERE id > ? AND id <= ? ORDER BY id LIMIT 1 OFFSET ?",
+                (done_id, upto_id, max(1, batch_size) - 1),
+            ).fetchone()
+            last = row[0] if row else upto_id
+            changed = m.rewrite(conn, done_id, last)
+            claimed = conn.execute(
+                "UPDATE schema_backfill SET done_id = ? WHERE version = ? AND done_id = ?", (last, version, done_id)
+            ).rowcount
+            if not claimed:
+                conn.rollback()  # another caller committed this range first
+                continue
+            total += changed
+        if pause_s > 0:
+            time.sleep(pause_s)
+
+
+class BackfillRunner:
+    """Single-flight run_backfills() for one process.
+
+    Safe to call after each insert: if another thread is already running the
+    backfills it returns at once and that thread makes one more pass, so
+    calls never pile up behind a long legacy backfill.
+    """
+
+    def __init__(self, db, batch_size: int = DEFAULT_BATCH, pause_s: float = 0.0):
+        self.db = db
+        self.batch_size = batch_size
+        self.pause_s = pause_s
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def run(self) -> int:
+        total = 0
+        self._dirty = True
+        while self._dirty:
+            if not self._lock.acquire(blocking=False):
+                return total
+            try:
+                self._dirty = False
+                total += run_backfills(self.db, self.batch_size, self.pause_s)
+            finally:
+                self._lock.release()
+        return total
+
+    def start(self):
+        """run() on a daemon thread, for writers without a worker pool."""
+        threading.Thread(target=self.run, daemon=True).start()
+
+
+def backfill_state(conn, name: str, migrations=MIGRATIONS) -> tuple[int, int] | None:
+    """(done_id, upto_id) of a migration's rewrite, or None if it was never queued."""
+    version = next(m.version for m in migrations if m.name == name)
+    return conn.execute("SELECT done_id, upto_id FROM schema_backfill WHERE version = ?", (version,)).fetchone()
+
+
+def status(db, migrations=MIGRATIONS) -> dict:
+    with db.transaction() as conn:
+        init_schema_tables(conn)
+        applied = {
+            v: {"name": n, "applied_at": a}
+            for v, n, a in conn.execute("SELECT version, name, applied_at FROM schema_version")
+        }
+        backfills = {v: (d, u) for v, d, u in conn.execute("SELECT version, done_id, upto_id FROM schema_backfill")}
+    out = []
+    for m in migrations:
+        item = {"version": m.version, "name": m.name, "applied_at": applied.get(m.version, {}).get("applied_at")}
+        if m.version in backfills:
+            done_id, upto_id = backfills[m.version]
+            item["backfill"] = {"done_id": done_id, "upto_id": upto_id, "finished": done_id >= upto_id}
+        out.append(item)
+    return {"version": max(applied, default=0), "latest": migrations[-1].version, "migrations": out}
+
+
+def main():
+    from db import ConnectionManager, sqlite_options_from_env
+
+    parser = argparse.ArgumentParser(description="Apply schema migrations and run their backfills.")
+    parser.add_argument("--db", default="smartdocai.db")
+    parser.add_argument("--status", action="store_true", help="only print the migration state")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH)
+    parser.add_argument("--pause-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    db = ConnectionManager(args.db, **sqlite_options_from_env())
+    try:
+        if not args.status:
+            migrate(db)
+            start = time.perf_counter()
+            changed = run_backfills(db, args.batch, args.pause_ms / 1000)
+            print(json.dumps({"rows_changed": changed, "seconds": round(time.perf_counter() - start, 3)}))
+        print(json.dumps(status(db), indent=2))
+    finally:
+        db.close_all()
+
+
+if __name__ == "__main__":
+    main()
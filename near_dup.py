@@ -0,0 +1,172 @@
+# ================================
+#  Near-Duplicate Detection
+# ================================
+# MinHash signatures over word shingles, indexed with LSH band buckets in
+# SQLite. A lookup only touches the buckets a document hashes to, so it is
+# sublinear in corpus size. With 16 bands of 8 rows, pairs are likely to
+# become candidates from about 0.7 estimated Jaccard similarity up.
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)  # fixed: signatures must be stable across processes and restarts
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text: str) -> np.ndarray | None:
+    """NUM_PERM uint64 minimums, or None when the text has no tokens."""
+    hashes = shingle_hashes(text)
+    if hashes.size == 0:
+        return None
+    # a < 2^31 and x < 2^32, so a*x + b stays below 2^64
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE).min(axis=1)
+
+
+def band_keys(sig: np.ndarray) -> list[tuple[int, int]]:
+    """(band, bucket) pairs; bucket is a signed 64-bit hash of the band's rows."""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "big", signed=True)))
+    return keys
+
+
+def sig_to_blob(sig: np.ndarray) -> bytes:
+    return sig.astype("<u8").tobytes()
+
+
+def blob_to_sig(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u8").astype(np.uint64)
+
+
+def create_minhash_tables(conn) -> bool:
+    """Schema step of the minhash migration; True if the tables were created empty."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'minhash_signatures'"
+    ).fetchone()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS minhash_signatures (
+            resume_id INTEGER PRIMARY KEY,
+            sig BLOB NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            resume_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, resume_id)
+        ) WITHOUT ROWID
+        """
+    )
+    return not exists
+
+
+def index_signature(conn, resume_id: int, sig: np.ndarray | None, replace: bool = True) -> bool:
+    """Store a signature and its LSH buckets (caller owns the transaction).
+
+    With ``replace=False`` a row that already has a signature is left alone;
+    returns whether the signature was stored.
+    """
+    if sig is None:
+        return False
+    stored = conn.execute(
+        f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO minhash_signatures (resume_id, sig) VALUES (?, ?)",
+        (resume_id, sig_to_blob(sig)),
+    ).rowcount
+    if not stored:
+        return False
+    conn.executemany(
+        "INSERT OR IGNORE INTO lsh_buckets (band, bucket, resume_id) VALUES (?, ?, ?)",
+        ((band, bucket, resume_id) for band, bucket in band_keys(sig)),
+    )
+    return True
+
+
+def unindex_signature(conn, resume_id: int):
+    """Drop a resume's signature and buckets, e.g. before its text is replaced."""
+    old = load_signature(conn, resume_id)
+    if old is None:
+        return
+    conn.executemany(
+        "DELETE FROM lsh_buckets WHERE band = ? AND bucket = ? AND resume_id = ?",
+        ((band, bucket, resume_id) for band, bucket in band_keys(old)),
+    )
+    conn.execute("DELETE FROM minhash_signatures WHERE resume_id = ?", (resume_id,))
+
+
+def find_similar(conn, sig: np.ndarray | None, threshold: float = DEFAULT_THRESHOLD,
+                 limit: int = 10, exclude_id: int | None = None) -> list[dict]:
+    """Stored resumes whose estimated Jaccard similarity to ``sig`` is at least ``threshold``."""
+    if sig is None:
+        return []
+    keys = band_keys(sig)
+    marks = ", ".join("(?, ?)" for _ in keys)
+    params = [v for key in keys for v in key]
+    # CROSS JOIN pins the join order so each key is a primary-key seek on lsh_buckets
+    candidates = conn.execute(
+        f"""
+        WITH keys (band, bucket) AS (VALUES {marks})
+        SELECT s.resume_id, s.sig FROM minhash_signatures s
+        WHERE s.resume_id IN (
+            SELECT b.resume_id FROM keys CROSS JOIN lsh_buckets b
+            ON b.band = keys.band AND b.bucket = keys.bucket
+        )
+        """,
+        params,
+    ).fetchall()
+    matches = []
+    for resume_id, blob in candidates:
+        if resume_id == exclude_id:
+            continue
+        similarity = float(np.mean(blob_to_sig(blob) == sig))
+        if similarity >= threshold:
+            matches.append({"id": resume_id, "similarity": round(similarity, 4)})
+    matches.sort(key=lambda m: (-m["similarity"], m["id"]))
+    return matches[:limit]
+
+
+def load_signature(conn, resume_id: int) -> np.ndarray | None:
+    row = conn.execute("SELECT sig FROM minhash_signatures WHERE resume_id = ?", (resume_id,)).fetchone()
+    return blob_to_sig(row[0]) if row else None
+
+
+def sign_rows(conn, after_id: int, upto_id: int) -> int:
+    """Rewrite step of the minhash migration: sign and bucket ids in (after_id, upto_id]
+    that have no signature yet."""
+    rows = conn.execute(
+        """
+        SELECT id, content FROM resume_text
+        WHERE id > ? AND id <= ?
+          AND id NOT IN (SELECT resume_id FROM minhash_signatures WHERE resume_id > ? AND resume_id <= ?)
+        """,
+        (after_id, upto_id, after_id, upto_id),
+    ).fetchall()
+    # Sign before the first write takes the lock; the read above ran without
+    # it, so only rows still unsigned are stored
+    sigs = [(resume_id, minhash_signature(text or "")) for resume_id, text in rows]
+    return sum(index_signature(conn, resume_id, sig, replace=False) for resume_id, sig in sigs)
@@ -1,15 +1,12 @@
+import time
+_PAGE_T0 = time.perf_counter()
+
 import os
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
 import streamlit as st
-from gtts import gTTS
-import whisper
 import tempfile
 import base64
-import numpy as np
-import soundfile as sf
-import easyocr
-import cv2
 import requests
 
 # ---------------- Config ----------------
@@ -17,10 +14,112 @@ BACKEND_URL = os.environ.get("SMARTDOCAI_BACKEND", "http://127.0.0.1:8000")
 
 st.set_page_config(page_title="SmartDocAI | Features", page_icon="🧠", layout="wide")
 
+# ---------------- Lazy engines ----------------
+# Whisper (torch), EasyOCR, OpenCV and gTTS are imported and their models
+# loaded the first time a feature needs them, once per server process, so a
+# tab never pays for another tab's engine. Timings feed the startup report.
+@st.cache_resource(show_spinner=False)
+def component_timings():
+    """Process-wide {component: {"import_ms", "load_ms"}}."""
+    return {"page": {"import_ms": round((time.perf_counter() - _PAGE_T0) * 1000, 1), "load_ms": None}}
+
+
+def record_timing(name, import_s, load_s=None):
+    component_timings()[name] = {
+        "import_ms": round(import_s * 1000, 1),
+        "load_ms": round(load_s * 1000, 1) if load_s is not None else None,
+    }
+
+
+@st.cache_resource(show_spinner="Loading Whisper model (first use)...")
+def get_whisper_model():
+    t0 = time.perf_counter()
+    import whisper
+    t1 = time.perf_counter()
+    model = whisper.load_model("base")
+    record_timing("whisper", t1 - t0, time.perf_counter() - t1)
+    return model
+
+
 @st.cache_resource(show_spinner=False)
-def load_model():
-    return whisper.load_model("base")
-model = load_model()
+def get_cv2():
+    t0 = time.perf_counter()
+    import cv2
+    record_timing("cv2", time.perf_counter() - t0)
+    return cv2
+
+
+@st.cache_resource(show_spinner="Loading OCR model (first use)...")
+def get_ocr_reader():
+    t0 = time.perf_counter()
+    import easyocr
+    t1 = time.perf_counter()
+    reader = easyocr.Reader(['en'], gpu=False)
+    record_timing("easyocr", t1 - t0, time.perf_counter() - t1)
+    return reader
+
+
+@st.cache_resource(show_spinner=False)
+def get_tts():
+    t0 = time.perf_counter()
+    from gtts import gTTS
+    record_timing("gtts", time.perf_counter() - t0)
+    return gTTS
+
+
+def show_startup_report():
+    with st.sidebar.expander("⏱️ Startup timings"):
+        timings = component_timings()
+        st.caption("Import and model-load time per component, measured on first use in this server process.")
+        st.table([{"component": name, **t} for name, t in timings.items()])
+        st.json(timings, expanded=False)
+
+
+component_timings()  # first run in this process: records the page's own import time
+
+
+# ---------------- Backend calls ----------------
+class CachedResponse:
+    """Stands in for a requests.Response when the data is already in hand
+    (a finished job's result, or a 304's cached /insights body)."""
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+
+    def json(self):
+        return self._data
+
+
+def wait_for_job(job_id, poll_seconds=1.0, max_wait=600):
+    """Poll an async upload job until it finishes; returns a response-like object."""
+    deadline = time.time() + max_wait
+    while time.time() < deadline:
+        job_resp = requests.get(f"{BACKEND_URL}/jobs/{job_id}", timeout=10)
+        if job_resp.status_code != 200:
+            return job_resp
+        job = job_resp.json()
+        if job["status"] == "done":
+            return CachedResponse(200, job["result"])
+        if job["status"] == "failed":
+            return CachedResponse(200, {"error": job.get("error") or "Processing failed"})
+        time.sleep(poll_seconds)
+    return CachedResponse(200, {"error": f"Timed out waiting for job {job_id}"})
+
+
+def get_insights(params):
+    """GET /insights with If-None-Match; a 304 reuses the copy kept in the session."""
+    cache = st.session_state.setdefault("insights_etags", {})
+    key = tuple(sorted(params.items()))
+    headers = {"If-None-Match": cache[key][0]} if key in cache else {}
+    resp = requests.get(f"{BACKEND_URL}/insights", params=params, headers=headers, timeout=30)
+    if resp.status_code == 304:
+        return CachedResponse(200, cache[key][1])
+    if resp.status_code == 200 and resp.headers.get("ETag"):
+        cache[key] = (resp.headers["ETag"], resp.json())
+    return resp
+
 
 # ---------------- Styling ----------------
 def set_background(image_path):
@@ -84,12 +183,13 @@ if option == "🖼️ Image to Text":
     image_file = st.file_uploader("Upload an image", type=["jpg", "jpeg", "png"])
     if image_file:
         st.image(image_file, caption="Uploaded Image", use_container_width=True)
+        cv2 = get_cv2()
+        import numpy as np
         file_bytes = np.asarray(bytearray(image_file.read()), dtype=np.uint8)
         image_np = cv2.imdecode(file_bytes, 1)
 
+        reader = get_ocr_reader()
         with st.spinner("🔍 Extracting text..."):
-            reader = easyocr.Reader(['en'], gpu=False)
-
             height, width, _ = image_np.shape
             mid = width // 2
             left_col = image_np[:, :mid]
@@ -108,7 +208,7 @@ if option == "🖼️ Image to Text":
             st.markdown("---")
             st.subheader("🔊 Text to Voice from Image")
             with st.spinner("Generating voice..."):
-                tts = gTTS(text=extracted_text, lang="en")
+                tts = get_tts()(text=extracted_text, lang="en")
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
                     tts.save(temp_audio.name)
                     audio_path = temp_audio.name
@@ -133,7 +233,7 @@ elif option == "🎤 Voice to Text":
             temp_path = temp_audio.name
 
         with st.spinner("Transcribing with Whisper..."):
-            result = model.transcribe(temp_path)
+            result = get_whisper_model().transcribe(temp_path)
 
         st.success("✅ Transcription Complete:")
         st.markdown(f'<div class="transcript-box">{result["text"]}</div>', unsafe_allow_html=True)
@@ -148,7 +248,7 @@ elif option == "📝 Text to Voice":
     user_input = st.text_area("Your text here...", height=150)
     if st.button("🔊 Convert and Play"):
         if user_input.strip():
-            tts = gTTS(text=user_input, lang="en")
+            tts = get_tts()(text=user_input, lang="en")
             with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
                 tts.save(temp_audio.name)
                 audio_path = temp_audio.name
@@ -175,7 +275,9 @@ elif option == "📄 Resume Insights":
                 try:
                     with st.spinner("Uploading to backend and generating summary..."):
                         files = {"file": (pdf_file.name, pdf_file.read(), "application/pdf")}
-                        resp = requests.post(f"{BACKEND_URL}/upload-resume", files=files, timeout=90)
+                        resp = requests.post(f"{BACKEND_URL}/upload-resume", params={"async": "true"}, files=files, timeout=30)
+                        if resp.status_code == 202:
+                            resp = wait_for_job(resp.json()["job_id"])
                     if resp.status_code == 200:
                         data = resp.json()
                         if "error" in data:
@@ -198,7 +300,7 @@ elif option == "📄 Resume Insights":
     with tabs[1]:
         try:
             with st.spinner("Fetching history..."):
-                hist_resp = requests.get(f"{BACKEND_URL}/insights?limit=50", timeout=30)
+                hist_resp = get_insights({"limit": 50, "fields": "light"})
             if hist_resp.status_code == 200:
                 payload = hist_resp.json()
                 if isinstance(payload, dict) and "error" in payload:
@@ -210,7 +312,10 @@ elif option == "📄 Resume Insights":
                     else:
                         labels = [f"#{it['id']} • {it['filename']} • {it['uploaded_at']}" for it in items]
                         idx = st.selectbox("Select an entry", options=list(range(len(items))), format_func=lambda i: labels[i])
-                        sel = items[idx]
+                        # The listing is id/filename/timestamp only; load the details for the selection
+                        sel = get_insights(
+                            {"id": items[idx]["id"], "fields": "filename,summary,top_words,uploaded_at,used_fallback"}
+                        ).json()
 
                         st.markdown("---")
                         colA, colB = st.columns([2, 1])
@@ -241,6 +346,8 @@ elif option == "📄 Resume Insights":
 
     st.markdown('</div>', unsafe_allow_html=True)
 
+show_startup_report()
+
 # ---------------- Footer ----------------
 st.markdown("""
     <div class="footer">
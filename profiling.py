@@ -0,0 +1,166 @@
+# ================================
+#  Upload Profiling
+# ================================
+# Opt-in cProfile capture for individual uploads. Upload work runs on worker
+# processes and threads, so each offloaded call is profiled where it runs
+# (profiled_call) and its raw stats travel back with the result. A
+# ProfileSession collects them and saves one merged pstats file per upload,
+# plus a small JSON sidecar with per-call wall times. Only the newest
+# ``keep`` profiles are kept on disk.
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Session of the upload being processed in this context, if it is profiled
+active_session: ContextVar["ProfileSession | None"] = ContextVar("active_session", default=None)
+# Set per request when the caller asked for a profile (header)
+profile_requested: ContextVar[bool] = ContextVar("profile_requested", default=False)
+
+
+def profiled_call(fn, *args):
+    """Run ``fn(*args)`` under cProfile; returns (result, marshalled stats, seconds).
+
+    Picklable, so it can run on a process pool like ``fn`` itself.
+    """
+    prof = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        result = prof.runcall(fn, *args)
+    finally:
+        elapsed = time.perf_counter() - start
+    prof.create_stats()
+    return result, marshal.dumps(prof.stats), elapsed
+
+
+class _RawStats:
+    """Adapter so pstats.Stats can load a marshalled stats dict."""
+
+    def __init__(self, raw: bytes):
+        self.stats = marshal.loads(raw)
+
+    def create_stats(self):
+        pass
+
+
+class ProfileSession:
+    def __init__(self, profile_id: str, label: str, reason: str):
+        self.id = profile_id
+        self.label = label
+        self.reason = reason
+        self.started_at = time.time()
+        self.calls: list[dict] = []
+        self._raw: list[bytes] = []
+        self._lock = threading.Lock()
+
+    def add(self, fn, raw: bytes, seconds: float):
+        with self._lock:
+            self._raw.append(raw)
+            self.calls.append({"call": getattr(fn, "__qualname__", repr(fn)), "seconds": round(seconds, 4)})
+
+
+class Profiler:
+    def __init__(self, path: str, sample_rate: float = 0.0, keep: int = 50):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self._armed = 0
+        self._lock = threading.Lock()
+
+    def arm(self, count: int):
+        """Profile the next ``count`` uploads regardless of the sample rate."""
+        with self._lock:
+            self._armed = max(0, count)
+
+    def start(self, label: str) -> ProfileSession | None:
+        """A session if this upload should be profiled, else None."""
+        if profile_requested.get():
+            reason = "requested"
+        else:
+            with self._lock:
+                if self._armed > 0:
+                    self._armed -= 1
+                    reason = "armed"
+                elif self.sample_rate > 0 and random.random() < self.sample_rate:
+                    reason = "sampled"
+                else:
+                    return None
+        return ProfileSession(uuid.uuid4().hex, label, reason)
+
+    def save(self, session: ProfileSession, error: str | None = None):
+        """Merge the session's stats into <id>.prof, write <id>.json, prune old profiles."""
+        if not session._raw:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        stats = pstats.Stats(_RawStats(session._raw[0]))
+        for raw in session._raw[1:]:
+            stats.add(_RawStats(raw))
+        stats.dump_stats(os.path.join(self.path, f"{session.id}.prof"))
+        meta = {
+            "id": session.id,
+            "label": session.label,
+            "reason": session.reason,
+            "started_at": session.started_at,
+            "wall_seconds": round(time.time() - session.started_at, 4),
+            "calls": session.calls,
+            "error": error,
+        }
+        with open(os.path.join(self.path, f"{session.id}.json"), "w") as f:
+            json.dump(meta, f)
+        self.prune()
+
+    def prune(self):
+        metas = sorted(self._meta_files(), key=os.path.getmtime, reverse=True)
+        for meta in metas[self.keep:]:
+            for path in (meta, meta[: -len(".json")] + ".prof"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _meta_files(self) -> list[str]:
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.path, n) for n in names if n.endswith(".json")]
+
+    def list(self) -> list[dict]:
+        items = []
+        for path in self._meta_files():
+            try:
+                with open(path) as f:
+                    items.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(items, key=lambda m: m["started_at"], reverse=True)
+
+    def file(self, profile_id: str) -> str | None:
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        path = os.path.join(self.path, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def report(self, profile_id: str, sort: str = "cumulative", top: int = 40) -> str | None:
+        """Plain-text pstats listing of one profile."""
+        path = self.file(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats(sort).print_stats(top)
+        return out.getvalue()
+
+    def state(self) -> dict:
+        with self._lock:
+            armed = self._armed
+        return {"sample_rate": self.sample_rate, "keep": self.keep, "armed": armed, "stored": len(self._meta_files())}
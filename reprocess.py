@@ -0,0 +1,278 @@
+# ================================
+#  Reprocessing CLI
+# ================================
+# Re-runs summarization and/or extraction for stored resumes picked by a
+# predicate, e.g. rows that got the fallback summary because Sarvam was
+# down at upload time, or rows extracted by an older EXTRACTOR_VERSION.
+# Run it from the backend's working directory: it imports backend.py for
+# the same database, Sarvam client, summary cache and extraction chain.
+#
+#   python reprocess.py --fallback-only --workers 8
+#   python reprocess.py --extract --extractor-version-below 2 --since 2024-01-01
+#   python reprocess.py --fallback-only --dry-run
+#
+# Rows are taken in id order, BATCH at a time, processed concurrently
+# (threads for Sarvam, processes for extraction), and written back in one
+# transaction per batch together with the run's checkpoint, so an
+# interrupted run resumes after its last committed batch when started again
+# with the same predicate (or --run name). Only ids that existed when the
+# run started are visited. A row keeps its summary when Sarvam still fails;
+# if the circuit breaker opens, the run stops before the first such row so
+# the next run picks it up again.
+#
+# Re-extracted text replaces the stored content and is re-indexed for
+# search, term statistics and near-duplicate detection. The /match matrix is
+# append-only and owned by the server process, so it keeps the old terms of
+# re-extracted rows; stop the server and delete SMARTDOCAI_MATCH_DIR to
+# rebuild it.
+import argparse
+import hashlib
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+
+from content_store import load_content, replace_content
+from extraction import EXTRACTOR_VERSION, extract_pages_chain, join_pages
+from near_dup import minhash_signature, index_signature, unindex_signature
+from response_cache import bump_table_version
+from search import index_resume, is_indexed, unindex_resume
+from term_stats import add_document, is_counted, remove_document
+
+DEFAULT_BATCH = 50
+
+
+def build_predicate(args) -> tuple[str, list]:
+    where, params = [], []
+    if args.fallback_only:
+        # app.py rows may still hold 'True' until the schema backfill reaches them
+        where.append("CAST(used_fallback AS TEXT) IN ('1', 'True', 'true')")
+    if args.since:
+        where.append("uploaded_at >= ?")
+        params.append(args.since)
+    if args.until:
+        where.append("uploaded_at < ?")
+        params.append(args.until)
+    if args.extractor_version_below is not None:
+        where.append("(extractor_version IS NULL OR extractor_version < ?)")
+        params.append(args.extractor_version_below)
+    if args.extractor:
+        where.append("extractor = ?")
+        params.append(args.extractor)
+    return " AND ".join(where) or "1", params
+
+
+def run_spec(args) -> dict:
+    return {
+        "fallback_only": args.fallback_only,
+        "since": args.since,
+        "until": args.until,
+        "extractor_version_below": args.extractor_version_below,
+        "extractor": args.extractor,
+        "extract": args.extract,
+        "summarize": args.summarize,
+    }
+
+
+def run_name(spec: dict) -> str:
+    return "run-" + hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def load_checkpoint(db, name: str, spec: dict, restart: bool) -> tuple[int, int, int]:
+    """(done_id, upto_id, rows_done) for the run, creating it on first use."""
+    now = datetime.utcnow().isoformat()
+    with db.transaction() as conn:
+        if restart:
+            conn.execute("DELETE FROM reprocess_runs WHERE name = ?", (name,))
+        row = conn.execute("SELECT spec, done_id, upto_id, rows_done FROM reprocess_runs WHERE name = ?", (name,)).fetchone()
+        if row:
+            if json.loads(row[0]) != spec:
+                raise SystemExit(f"Run {name!r} was started with different options; pass --restart or another --run.")
+            return row[1], row[2], row[3]
+        upto = conn.execute("SELECT COALESCE(MAX(id), 0) FROM resumes").fetchone()[0]
+        conn.execute(
+            "INSERT INTO reprocess_runs (name, spec, done_id, upto_id, rows_done, started_at, updated_at) VALUES (?, ?, 0, ?, 0, ?, ?)",
+            (name, json.dumps(spec, sort_keys=True), upto, now, now),
+        )
+        return 0, upto, 0
+
+
+def reextract(file_path: str, chain: tuple[str, ...]) -> tuple[str, str, object]:
+    """Worker-process half of a re-extraction: (text, engine, MinHash signature)."""
+    pages, attempts = extract_pages_chain(file_path, chain)
+    text = join_pages(pages)
+    return text, attempts[-1]["engine"], minhash_signature(text)
+
+
+def process_row(backend, row: dict, extract_pool, chain, extract: bool, summarize: bool) -> dict:
+    """Compute the new values for one row; nothing is written here."""
+    out = {"id": row["id"]}
+    with backend.db.transaction() as conn:
+        text = load_content(conn, row["id"])
+    if extract:
+        if not row["filepath"]:
+            return {**out, "error": "no_file"}
+        try:
+            new_text, engine, minhash = extract_pool.submit(reextract, row["filepath"], chain).result()
+        except FileNotFoundError:
+            return {**out, "error": "missing_file"}
+        if new_text.strip():
+            out.update(content=new_text, extractor=engine, minhash=minhash)
+            text = new_text
+    if summarize and text and text.strip():
+        summary = backend.summarize_with_sarvam(text)
+        if summary is not None:
+            out.update(summary=summary, top_words=backend.extract_top_words(text, n=5))
+        else:
+            out["still_fallback"] = True
+    return out
+
+
+def write_results(conn, results: list[dict]) -> int:
+    """Apply one batch of results (caller owns the transaction); returns rows changed."""
+    changed = 0
+    for r in results:
+        if "content" not in r and "summary" not in r:
+            continue
+        row = conn.execute("SELECT summary, uploaded_at FROM resumes WHERE id = ?", (r["id"],)).fetchone()
+        if row is None:
+            continue  # deleted meanwhile
+        old_summary, uploaded_at = row
+        old_content = load_content(conn, r["id"])
+        content = r.get("content", old_content)
+        summary = r.get("summary", old_summary)
+        # Index with the new values even if the migration backfills
+        # (migrations.py) have not reached the row: they skip indexed rows
+        if is_indexed(conn, r["id"]):
+            unindex_resume(conn, r["id"], old_content, old_summary)
+        if "content" in r:
+            replace_content(conn, r["id"], content)
+            bump_table_version(conn, "resumes")  # the text lives outside resumes' versioned columns
+            if is_counted(conn, r["id"]):
+                remove_document(conn, r["id"], old_content, uploaded_at)
+            add_document(conn, r["id"], content, uploaded_at)
+            unindex_signature(conn, r["id"])
+            index_signature(conn, r["id"], r["minhash"])
+            conn.execute(
+                "UPDATE resumes SET extractor = ?, extractor_version = ? WHERE id = ?",
+                (r["extractor"], EXTRACTOR_VERSION, r["id"]),
+            )
+        if "summary" in r:
+            conn.execute(
+                "UPDATE resumes SET summary = ?, top_words = ?, used_fallback = 0 WHERE id = ?",
+                (summary, json.dumps(r["top_words"]), r["id"]),
+            )
+        index_resume(conn, r["id"], content, summary)
+        changed += 1
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run summarization and/or extraction for stored resumes.")
+    parser.add_argument("--fallback-only", action="store_true", help="rows that got the fallback summary")
+    parser.add_argument("--since", help="uploaded_at >= this ISO date/time")
+    parser.add_argument("--until", help="uploaded_at < this ISO date/time")
+    parser.add_argument("--extractor-version-below", type=int, default=None, metavar="N",
+                        help=f"rows extracted before version N (current: {EXTRACTOR_VERSION}) or unknown")
+    parser.add_argument("--extractor", help="rows whose text came from this engine")
+    parser.add_argument("--extract", action="store_true", help="re-extract text from the stored PDF")
+    parser.add_argument("--summarize", action="store_true", help="re-run Sarvam (default unless only --extract)")
+    parser.add_argument("--workers", type=int, default=4, help="rows processed at once")
+    parser.add_argument("--extract-workers", type=int, default=None, help="extraction processes (default SMARTDOCAI_EXTRACT_WORKERS)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="rows per committed batch")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many rows (0 = all)")
+    parser.add_argument("--run", help="checkpoint name (default: derived from the options)")
+    parser.add_argument("--restart", action="store_true", help="discard the run's checkpoint first")
+    parser.add_argument("--dry-run", action="store_true", help="only count matching rows")
+    args = parser.parse_args()
+    if not args.extract:
+        args.summarize = True
+
+    import backend  # noqa: E402  (database, Sarvam client and settings of the server)
+
+    db = backend.db
+    predicate, params = build_predicate(args)
+    spec = run_spec(args)
+    name = args.run or run_name(spec)
+
+    if args.dry_run:
+        count = db.connection().execute(f"SELECT COUNT(*) FROM resumes WHERE {predicate}", params).fetchone()[0]
+        print(json.dumps({"run": name, "spec": spec, "matching_rows": count}, indent=2))
+        return
+    if args.summarize and not backend.sarvam_client.configured:
+        raise SystemExit("Sarvam is not configured (SARVAM_SUMMARY_URL / SARVAM_API_KEY); nothing to summarize with.")
+
+    done_id, upto_id, rows_done = load_checkpoint(db, name, spec, args.restart)
+    totals = {"processed": 0, "changed": 0, "still_fallback": 0, "errors": {}}
+    stopped = None
+    extract_workers = args.extract_workers or max(1, backend.EXTRACT_WORKERS)
+    # Spawned, not forked: workers start on demand from threads that may hold locks
+    extract_ctx = (
+        ProcessPoolExecutor(extract_workers, mp_context=multiprocessing.get_context("spawn"))
+        if args.extract else nullcontext()
+    )
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max(1, args.workers)) as pool, extract_ctx as extract_pool:
+        while done_id < upto_id and not stopped and not (args.limit and totals["processed"] >= args.limit):
+            size = max(1, args.batch)
+            if args.limit:
+                size = min(size, args.limit - totals["processed"])
+            cols = ("id", "filepath")
+            rows = [
+                dict(zip(cols, r)) for r in db.connection().execute(
+                    f"SELECT id, filepath FROM resumes WHERE id > ? AND id <= ? AND {predicate} ORDER BY id LIMIT ?",
+                    [done_id, upto_id, *params, size],
+                )
+            ]
+            last = rows[-1]["id"] if len(rows) == size else upto_id
+            results = list(pool.map(
+                lambda row: process_row(backend, row, extract_pool, backend.EXTRACT_CHAIN, args.extract, args.summarize),
+                rows,
+            ))
+            failed = [r["id"] for r in results if r.get("still_fallback")]
+            if failed and backend.sarvam_breaker.state == "open":
+                # Sarvam is down: keep what succeeded, resume from the first failure next time
+                last = min(failed) - 1
+                rows = [row for row in rows if row["id"] <= last]
+                results = [r for r in results if r["id"] <= last or "summary" in r]
+                stopped = "sarvam_unavailable"
+            with db.transaction() as conn:
+                conn.execute("BEGIN IMMEDIATE")  # is_indexed()/is_counted() must hold until commit
+                changed = write_results(conn, results)
+                conn.execute(
+                    "UPDATE reprocess_runs SET done_id = ?, rows_done = rows_done + ?, updated_at = ? WHERE name = ?",
+                    (last, len(rows), datetime.utcnow().isoformat(), name),
+                )
+            done_id = last
+            totals["processed"] += len(rows)
+            totals["changed"] += changed
+            totals["still_fallback"] += sum(1 for r in results if r.get("still_fallback"))
+            for r in results:
+                if "error" in r:
+                    totals["errors"][r["error"]] = totals["errors"].get(r["error"], 0) + 1
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name}: {totals['processed']} rows ({totals['processed'] / elapsed:.1f}/s), "
+                f"{totals['changed']} changed, at id {done_id}/{upto_id}",
+                file=sys.stderr,
+            )
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "run": name,
+        "spec": spec,
+        **totals,
+        "rows_done_total": rows_done + totals["processed"],
+        "finished": done_id >= upto_id,
+        "stopped": stopped,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(totals["processed"] / elapsed, 2) if elapsed > 0 else None,
+        "sarvam_breaker": backend.sarvam_breaker.state,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# ================================
+#  Response Cache
+# ================================
+# Per-table version counters and an in-process LRU of serialized responses.
+# Triggers bump a table's version on every insert, delete or visible update,
+# whichever process writes, so the version is a cheap validator for ETag /
+# Last-Modified. Cached responses are keyed by version, and the whole cache
+# is dropped the first time a newer version is seen.
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+
+def create_table_versions(conn, table: str, columns: tuple[str, ...]):
+    """Version ``table``; updates only count when they touch ``columns``.
+    Schema step of the resume_versions migration (migrations.py)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            modified_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(f"INSERT OR IGNORE INTO table_versions (name, version, modified_at) VALUES (?, 1, {_NOW})", (table,))
+    for event in ("INSERT", "DELETE", f"UPDATE OF {', '.join(columns)}"):
+        suffix = event.split()[0].lower()
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN {_bump(table)}; END")
+
+
+def _bump(table: str) -> str:
+    return f"UPDATE table_versions SET version = version + 1, modified_at = {_NOW} WHERE name = '{table}'"
+
+
+def bump_table_version(conn, table: str):
+    """Bump by hand for changes the triggers cannot see, e.g. a resume's text
+    replaced in the content tables (caller owns the transaction)."""
+    conn.execute(_bump(table))
+
+
+def table_version(conn, table: str) -> tuple[int, float]:
+    """(version, modified_at unix seconds)."""
+    return conn.execute("SELECT version, modified_at FROM table_versions WHERE name = ?", (table,)).fetchone()
+
+
+def validators(table: str, version: int, modified_at: float) -> dict:
+    return {"ETag": f'"{table}-{version}"', "Last-Modified": formatdate(modified_at, usegmt=True)}
+
+
+def not_modified(headers, etag: str, modified_at: float) -> bool:
+    """Whether request ``headers`` already hold the current representation."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ResponseCache:
+    """Bounded LRU of serialized responses for one version of the data."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._version = None
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sync_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, version, key):
+        with self._lock:
+            self._sync_version(version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, version, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                # Computed against data that has since changed (or is newer than
+                # anything seen yet); only keep it if it is the newest
+                if self._version is not None and version < self._version:
+                    return
+                self._sync_version(version)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
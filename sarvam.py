@@ -0,0 +1,272 @@
+# ================================
+#  Sarvam AI Client
+# ================================
+# Long-lived, pooled clients for the summary endpoint. Every call has a
+# total deadline, a bounded number of jittered retries, and goes through a
+# circuit breaker so a degraded Sarvam costs uploads nothing while it is open.
+# All failures return None; callers fall back to top words. An optional
+# on_error callback receives the class of each failed attempt for metrics.
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_PAYLOAD_CHARS = 4000  # keep payload small
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Open after ``threshold`` consecutive failures; allow one probe after ``cooldown`` seconds."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock=time.monotonic):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if self.clock() - self.opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at < self.cooldown or self._probing:
+                return False
+            self._probing = True  # half-open: let exactly one call through
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def release(self):
+        """End a call that got no verdict (cancelled, interrupted) without
+        changing the failure count, so a half-open probe does not stay taken."""
+        with self._lock:
+            self._probing = False
+
+
+class _SarvamBase:
+    def __init__(
+        self,
+        url: str | None,
+        api_key: str | None,
+        *,
+        attempt_timeout: float = 5.0,
+        deadline: float = 15.0,
+        retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 2.0,
+        pool_size: int = 10,
+        breaker: CircuitBreaker | None = None,
+        on_error=None,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.retries = max(0, retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self.on_error = on_error
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url and self.api_key)
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @staticmethod
+    def _payload(text: str) -> dict:
+        return {"text": text[:MAX_PAYLOAD_CHARS]}
+
+    @staticmethod
+    def _parse(status: int, body) -> str | None:
+        if status != 200 or not isinstance(body, dict):
+            return None
+        summary = body.get("summary")
+        if isinstance(summary, str) and summary.strip():
+            return summary.strip()
+        return None
+
+    @staticmethod
+    def error_class(exc: Exception) -> str:
+        if isinstance(exc, (requests.Timeout, httpx.TimeoutException)):
+            return "timeout"
+        if isinstance(exc, (requests.ConnectionError, httpx.TransportError)):
+            return "connection"
+        return "client_error"
+
+    def _report(self, kind: str):
+        if self.on_error is not None:
+            self.on_error(kind)
+
+    def _report_response(self, status: int):
+        self._report(f"http_{status // 100}xx" if status != 200 else "bad_response")
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class SarvamClient(_SarvamBase):
+    """Blocking client backed by a keep-alive ``requests.Session``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def summarize(self, text: str) -> str | None:
+        if not self.configured:
+            return None
+        if not self.breaker.allow():
+            self._report("breaker_open")
+            return None
+        try:
+            return self._summarize(text)
+        except BaseException:
+            # Cancellation and friends skip record_*(); don't leave a probe taken
+            self.breaker.release()
+            raise
+
+    def _summarize(self, text: str) -> str | None:
+        end = time.monotonic() + self.deadline
+        for attempt in range(self.retries + 1):
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                resp = self.session.post(
+                    self.url,
+                    json=self._payload(text),
+                    headers=self._headers(),
+                    timeout=min(self.attempt_timeout, remaining),
+                )
+            except Exception as e:
+                # connection error, timeout or bad URL: counts as a failed attempt
+                self._report(self.error_class(e))
+            else:
+                try:
+                    body = resp.json() if resp.status_code == 200 else None
+                except ValueError:
+                    body = None
+                summary = self._parse(resp.status_code, body)
+                if summary is not None:
+                    self.breaker.record_success()
+                    return summary
+                self._report_response(resp.status_code)
+                if resp.status_code not in RETRYABLE_STATUS:
+                    # Sarvam answered; the request itself was unusable
+                    self.breaker.record_success()
+                    return None
+
+            if attempt < self.retries:
+                delay = min(self._backoff(attempt), end - time.monotonic())
+                if delay > 0:
+                    time.sleep(delay)
+
+        self.breaker.record_failure()
+        return None
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncSarvamClient(_SarvamBase):
+    """Non-blocking client backed by a pooled ``httpx.AsyncClient``.
+
+    Create it inside the event loop that will use it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+        )
+
+    async def summarize(self, text: str) -> str | None:
+        if not self.configured:
+            return None
+        if not self.breaker.allow():
+            self._report("breaker_open")
+            return None
+        try:
+            return await self._summarize(text)
+        except BaseException:
+            # Cancellation and friends skip record_*(); don't leave a probe taken
+            self.breaker.release()
+            raise
+
+    async def _summarize(self, text: str) -> str | None:
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.deadline
+        for attempt in range(self.retries + 1):
+            remaining = end - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                resp = await self.client.post(
+                    self.url,
+                    json=self._payload(text),
+                    headers=self._headers(),
+                    timeout=min(self.attempt_timeout, remaining),
+                )
+            except Exception as e:
+                # connection error, timeout or bad URL: counts as a failed attempt
+                self._report(self.error_class(e))
+            else:
+                try:
+                    body = resp.json() if resp.status_code == 200 else None
+                except ValueError:
+                    body = None
+                summary = self._parse(resp.status_code, body)
+                if summary is not None:
+                    self.breaker.record_success()
+                    return summary
+                self._report_response(resp.status_code)
+                if resp.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    return None
+
+            if attempt < self.retries:
+                delay = min(self._backoff(attempt), end - loop.time())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        self.breaker.record_failure()
+        return None
+
+    async def aclose(self):
+        await self.client.aclose()
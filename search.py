@@ -0,0 +1,124 @@
+# ================================
+#  Full-Text Search
+# ================================
+# FTS5 index over resume content and summaries. It is an external-content
+# table over the resume_text view (content_store.py), so the text is not
+# stored a second time and snippets come from the compressed tiers. The view
+# needs the unz() function, so every connection must register it. Writers
+# may index new rows with index_resume() in the same transaction as the
+# insert; the resumes_fts migration backfill indexes every other row, old or
+# written by another process, and follows the table as it grows.
+import re
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+FTS_CONTENT_TABLE = "resume_text"
+
+
+def create_fts(conn) -> bool:
+    """Schema step of the resumes_fts migration; True if the index was created empty."""
+    existing = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'resumes_fts'"
+    ).fetchone()
+    if existing and f"content='{FTS_CONTENT_TABLE}'" not in existing[0]:
+        # Older index read resumes.content directly and was kept in sync by
+        # triggers; content now lives in compressed tiers, so rebuild it
+        for trigger in ("resumes_fts_ai", "resumes_fts_ad", "resumes_fts_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE resumes_fts")
+        existing = None
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+            content, summary,
+            content='{FTS_CONTENT_TABLE}', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+        """
+    )
+    return not existing
+
+
+def index_resume(conn, resume_id: int, content: str, summary: str):
+    """Add one resume to the index (caller owns the transaction)."""
+    conn.execute(
+        "INSERT INTO resumes_fts (rowid, content, summary) VALUES (?, ?, ?)",
+        (resume_id, content, summary),
+    )
+
+
+def unindex_resume(conn, resume_id: int, content: str, summary: str):
+    """Remove one resume from the index; needs the text it was indexed with."""
+    conn.execute(
+        "INSERT INTO resumes_fts (resumes_fts, rowid, content, summary) VALUES ('delete', ?, ?, ?)",
+        (resume_id, content, summary),
+    )
+
+
+def is_indexed(conn, resume_id: int) -> bool:
+    # The %_docsize shadow table has one row per indexed rowid
+    return conn.execute("SELECT 1 FROM resumes_fts_docsize WHERE id = ?", (resume_id,)).fetchone() is not None
+
+
+def index_rows(conn, after_id: int, upto_id: int) -> int:
+    """Rewrite step of the resumes_fts migration: index ids in (after_id, upto_id]
+    that are not indexed yet (rows stored by writers other than index_resume())."""
+    return conn.execute(
+        """
+        INSERT INTO resumes_fts (rowid, content, summary)
+        SELECT id, content, summary FROM resume_text
+        WHERE id > ? AND id <= ? AND id NOT IN (SELECT id FROM resumes_fts_docsize WHERE id > ? AND id <= ?)
+        """,
+        (after_id, upto_id, after_id, upto_id),
+    ).rowcount
+
+
+def fts_query(q: str) -> str | None:
+    """Turn free text into an FTS5 query: every term must match, each quoted
+    so user input can never be parsed as FTS syntax."""
+    terms = TOKEN_RE.findall(q)
+    if not terms:
+        return None
+    return " ".join(f'"{t}"' for t in terms)
+
+
+def search_resumes(db, q: str, limit: int = 20, offset: int = 0) -> list[dict]:
+    """BM25-ranked matches (best first) with highlighted snippets."""
+    match = fts_query(q)
+    if match is None:
+        return []
+    conn = db.connection()
+    # Rank on the bare index first; snippets are only built for the page
+    page = conn.execute(
+        "SELECT rowid, rank FROM resumes_fts WHERE resumes_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+        (match, limit, offset),
+    ).fetchall()
+    if not page:
+        return []
+    ids = [p[0] for p in page]
+    marks = ", ".join("?" for _ in ids)
+    details = {
+        r[0]: r[1:]
+        for r in conn.execute(
+            f"""
+            SELECT r.id, r.filename, r.uploaded_at,
+                   snippet(resumes_fts, 0, '<mark>', '</mark>', '…', 16),
+                   snippet(resumes_fts, 1, '<mark>', '</mark>', '…', 16)
+            FROM resumes_fts JOIN resumes r ON r.id = resumes_fts.rowid
+            WHERE resumes_fts MATCH ? AND resumes_fts.rowid IN ({marks})
+            """,
+            (match, *ids),
+        )
+    }
+    rows = [(rid, *details[rid][:2], rank, *details[rid][2:]) for rid, rank in page if rid in details]
+    return [
+        {
+            "id": r[0],
+            "filename": r[1],
+            "uploaded_at": r[2],
+            "score": round(-r[3], 4),  # rank is bm25(): lower is better; flip for readability
+            "content_snippet": r[4],
+            "summary_snippet": r[5],
+        }
+        for r in rows
+    ]
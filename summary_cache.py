@@ -0,0 +1,99 @@
+# ================================
+#  Summary Cache
+# ================================
+# Persistent Sarvam summary cache keyed by a hash of the normalized payload
+# text, so re-exported PDFs with identical text skip the network call.
+import hashlib
+import re
+import threading
+import time
+
+WS_RE = re.compile(r"\s+")
+
+
+def normalize_payload(text: str, max_chars: int) -> str:
+    """Collapse whitespace, then cut to the payload size sent to Sarvam."""
+    return WS_RE.sub(" ", text).strip()[:max_chars]
+
+
+def payload_key(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def create_table(conn):
+    """Schema step of the summary_cache migration (migrations.py)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            key TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache (last_used_at)")
+
+
+class SummaryCache:
+    """SQLite-backed LRU with a TTL and hit/miss counters."""
+
+    def __init__(self, db, ttl_seconds: float, max_entries: int):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT summary FROM summary_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE summary_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, summary: str):
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summary_cache (key, summary, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now),
+            )
+            # Expired first, then least recently used beyond the size bound
+            evicted = conn.execute("DELETE FROM summary_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+            evicted += conn.execute(
+                """
+                DELETE FROM summary_cache WHERE key IN (
+                    SELECT key FROM summary_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def stats(self) -> dict:
+        size = self.db.connection().execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
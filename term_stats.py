@@ -0,0 +1,160 @@
+# ================================
+#  Corpus Term Statistics
+# ================================
+# Document frequency and total count per term, overall and per upload day,
+# updated in the same transaction as each resume insert (or by the term_stats
+# migration backfill for rows other writers store) so corpus-level
+# questions never rescan resume text. Terms use the same tokenization as the
+# top-words fallback (lowercase, 4+ letters).
+import re
+from collections import Counter
+
+WORD_RE = re.compile(r"[A-Za-z]{4,}")
+
+
+def term_counts(text: str) -> Counter:
+    return Counter(w.lower() for w in WORD_RE.findall(text))
+
+
+def create_term_tables(conn) -> bool:
+    """Schema step of the term_stats migration; True if the aggregates were created empty."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'term_stats'"
+    ).fetchone()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS term_stats (
+            term TEXT PRIMARY KEY,
+            doc_freq INTEGER NOT NULL,
+            total_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_term_stats_doc_freq ON term_stats (doc_freq)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_term_stats_total_count ON term_stats (total_count)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS term_stats_daily (
+            day TEXT NOT NULL,
+            term TEXT NOT NULL,
+            doc_freq INTEGER NOT NULL,
+            total_count INTEGER NOT NULL,
+            PRIMARY KEY (day, term)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS corpus_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            docs INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO corpus_stats (id, docs) VALUES (1, 0)")
+    return not exists
+
+
+def create_doc_table(conn):
+    """Resumes the aggregates count, so the backfill never counts a row twice."""
+    conn.execute("CREATE TABLE IF NOT EXISTS term_stats_docs (resume_id INTEGER PRIMARY KEY)")
+
+
+def is_counted(conn, resume_id: int) -> bool:
+    return conn.execute("SELECT 1 FROM term_stats_docs WHERE resume_id = ?", (resume_id,)).fetchone() is not None
+
+
+def add_document(conn, resume_id: int, text: str, uploaded_at: str | None):
+    """Fold one document into the aggregates (caller owns the transaction)."""
+    conn.execute("INSERT INTO term_stats_docs (resume_id) VALUES (?)", (resume_id,))
+    _fold(conn, term_counts(text or ""), uploaded_at)
+
+
+def _fold(conn, counts: Counter, uploaded_at: str | None):
+    conn.executemany(
+        """
+        INSERT INTO term_stats (term, doc_freq, total_count) VALUES (?, 1, ?)
+        ON CONFLICT (term) DO UPDATE SET
+            doc_freq = doc_freq + 1,
+            total_count = total_count + excluded.total_count
+        """,
+        counts.items(),
+    )
+    if uploaded_at:
+        day = uploaded_at[:10]
+        conn.executemany(
+            """
+            INSERT INTO term_stats_daily (day, term, doc_freq, total_count) VALUES (?, ?, 1, ?)
+            ON CONFLICT (day, term) DO UPDATE SET
+                doc_freq = doc_freq + 1,
+                total_count = total_count + excluded.total_count
+            """,
+            ((day, term, n) for term, n in counts.items()),
+        )
+    conn.execute("UPDATE corpus_stats SET docs = docs + 1 WHERE id = 1")
+
+
+def remove_document(conn, resume_id: int, text: str, uploaded_at: str | None):
+    """Undo add_document() for a document whose text is being replaced."""
+    conn.execute("DELETE FROM term_stats_docs WHERE resume_id = ?", (resume_id,))
+    counts = term_counts(text or "")
+    conn.executemany(
+        "UPDATE term_stats SET doc_freq = doc_freq - 1, total_count = total_count - ? WHERE term = ?",
+        ((n, term) for term, n in counts.items()),
+    )
+    if uploaded_at:
+        conn.executemany(
+            "UPDATE term_stats_daily SET doc_freq = doc_freq - 1, total_count = total_count - ? WHERE day = ? AND term = ?",
+            ((n, uploaded_at[:10], term) for term, n in counts.items()),
+        )
+    conn.execute("UPDATE corpus_stats SET docs = docs - 1 WHERE id = 1")
+
+
+def count_rows(conn, after_id: int, upto_id: int) -> int:
+    """Rewrite step of the term_stats migration: count ids in (after_id, upto_id]
+    that are not counted yet."""
+    rows = conn.execute(
+        """
+        SELECT t.id, t.content, r.uploaded_at
+        FROM resume_text t JOIN resumes r ON r.id = t.id
+        WHERE t.id > ? AND t.id <= ?
+          AND t.id NOT IN (SELECT resume_id FROM term_stats_docs WHERE resume_id > ? AND resume_id <= ?)
+        """,
+        (after_id, upto_id, after_id, upto_id),
+    ).fetchall()
+    # Tokenize before the first write takes the lock; the read above ran
+    # without it, so claim each row as it is counted
+    docs = [(resume_id, term_counts(text or ""), uploaded_at) for resume_id, text, uploaded_at in rows]
+    counted = 0
+    for resume_id, counts, uploaded_at in docs:
+        if conn.execute("INSERT OR IGNORE INTO term_stats_docs (resume_id) VALUES (?)", (resume_id,)).rowcount:
+            _fold(conn, counts, uploaded_at)
+            counted += 1
+    return counted
+
+
+def top_terms(db, top: int = 20, since: str | None = None, by: str = "doc_freq") -> dict:
+    """Most frequent terms overall, or since a day (YYYY-MM-DD) from the daily buckets."""
+    order = "doc_freq" if by == "doc_freq" else "total_count"
+    conn = db.connection()
+    if since:
+        rows = conn.execute(
+            f"""
+            SELECT term, SUM(doc_freq) AS doc_freq, SUM(total_count) AS total_count
+            FROM term_stats_daily WHERE day >= ?
+            GROUP BY term ORDER BY {order} DESC, term LIMIT ?
+            """,
+            (since[:10], top),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            f"SELECT term, doc_freq, total_count FROM term_stats ORDER BY {order} DESC, term LIMIT ?",
+            (top,),
+        ).fetchall()
+    docs = conn.execute("SELECT docs FROM corpus_stats WHERE id = 1").fetchone()[0]
+    return {
+        "documents": docs,
+        "since": since[:10] if since else None,
+        "by": order,
+        "terms": [{"term": r[0], "doc_freq": r[1], "total_count": r[2]} for r in rows],
+    }
@@ -0,0 +1,27 @@
+from content_store import load_content, store_content
+from db import ConnectionManager
+from migrations import migrate
+from near_dup import minhash_signature
+from reprocess import write_results
+from response_cache import table_version, validators
+
+
+def test_reextract_changes_resumes_etag(tmp_path):
+    db = ConnectionManager(str(tmp_path / "smartdocai.db"))
+    migrate(db)
+    with db.transaction() as conn:
+        resume_id = conn.execute(
+            "INSERT INTO resumes (filename, filepath, summary, uploaded_at) VALUES ('a.pdf', 'a.pdf', 's', '2024-01-01')"
+        ).lastrowid
+        store_content(conn, resume_id, "old text")
+    before = validators("resumes", *table_version(db.connection(), "resumes"))["ETag"]
+
+    text = "new extracted text"
+    result = {"id": resume_id, "content": text, "extractor": "pdfplumber", "minhash": minhash_signature(text)}
+    with db.transaction() as conn:
+        assert write_results(conn, [result]) == 1
+
+    conn = db.connection()
+    assert load_content(conn, resume_id) == text
+    assert validators("resumes", *table_version(conn, "resumes"))["ETag"] != before
+    db.close_all()
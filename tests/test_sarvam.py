@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sarvam import AsyncSarvamClient, SarvamClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+BAD_SUMMARIES = [123, ["x"], {"text": "x"}, None, "   "]
+
+
+@pytest.mark.parametrize("summary", BAD_SUMMARIES)
+def test_sync_client_rejects_non_string_summary(summary):
+    errors = []
+    client = SarvamClient("http://sarvam.test", "key", retries=0, on_error=errors.append)
+    client.session.post = lambda *a, **kw: FakeResponse(200, {"summary": summary})
+    assert client.summarize("resume text") is None
+    assert errors == ["bad_response"]
+    client.close()
+
+
+@pytest.mark.parametrize("summary", BAD_SUMMARIES)
+def test_async_client_rejects_non_string_summary(summary):
+    errors = []
+
+    async def run():
+        client = AsyncSarvamClient("http://sarvam.test", "key", retries=0, on_error=errors.append)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"summary": summary}))
+        )
+        try:
+            return await client.summarize("resume text")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) is None
+    assert errors == ["bad_response"]
+
+
+def test_clients_return_string_summary():
+    client = SarvamClient("http://sarvam.test", "key", retries=0)
+    client.session.post = lambda *a, **kw: FakeResponse(200, {"summary": "  Senior engineer.  "})
+    assert client.summarize("resume text") == "Senior engineer."
+    client.close()